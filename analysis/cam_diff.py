@@ -0,0 +1,143 @@
+import os
+from extractors.cam_extractor import CamFile
+from readers.registry import reader_for_extension
+from utils.member_cache import member_hash
+
+# Unit columns compared for changed units
+UNIT_FIELDS = ('entity_type', 'x', 'y', 'z', 'owner')
+
+
+def diff_archives(old_path, new_path, expander='fast', cache=None):
+    """Compare two archives, usually successive saves of the same campaign.
+
+    Directory entries and member hashes are compared first; only UNI and
+    PLT members whose bytes changed are decoded and diffed at record level.
+    A MemberCache, if given, saves decompressing UNI payloads seen before.
+    Returns a JSON-serialisable report.
+    """
+    with CamFile(old_path, use_mmap=True) as old_cam, CamFile(new_path, use_mmap=True) as new_cam:
+        report = {
+            'old': old_path,
+            'new': new_path,
+            'added': [name for name in new_cam.files if name not in old_cam.files],
+            'removed': [name for name in old_cam.files if name not in new_cam.files],
+            'changed': [],
+            'unchanged': 0,
+            'members': {},
+        }
+
+        for name, new_info in new_cam.files.items():
+            old_info = old_cam.files.get(name)
+            if old_info is None:
+                continue
+            old_data = old_cam.member_data(old_info)
+            new_data = new_cam.member_data(new_info)
+            if old_info.size == new_info.size and member_hash(old_data) == member_hash(new_data):
+                report['unchanged'] += 1
+                continue
+
+            report['changed'].append(name)
+            differ = MEMBER_DIFFS.get(os.path.splitext(name)[1].lower())
+            if differ:
+                report['members'][name] = differ(old_data, new_data, name, expander, cache)
+
+    return report
+
+
+def diff_uni(old_data, new_data, name, expander='fast', cache=None):
+    """Diff two UNI members unit by unit, matching units by VU_ID"""
+    UniFile = reader_for_extension('.uni')
+    old_uni = UniFile(expander=expander, cache=cache)
+    old_uni.read_bytes(old_data, name)
+    new_uni = UniFile(expander=expander, cache=cache)
+    new_uni.read_bytes(new_data, name)
+    old_units = old_uni.units
+    new_units = new_uni.units
+    if old_units is None or new_units is None:
+        return {'error': 'decompression failed'}
+
+    old_ids = {key: i for i, key in enumerate(zip(old_units.id_num, old_units.id_creator))}
+    new_ids = {key: i for i, key in enumerate(zip(new_units.id_num, new_units.id_creator))}
+
+    changed = []
+    for key, new_index in new_ids.items():
+        old_index = old_ids.get(key)
+        if old_index is None:
+            continue
+        old_start, old_end = old_units.record_bounds(old_index)
+        new_start, new_end = new_units.record_bounds(new_index)
+        if old_units.payload[old_start:old_end] == new_units.payload[new_start:new_end]:
+            continue
+        fields = {}
+        for field in UNIT_FIELDS:
+            old_value = getattr(old_units, field)[old_index]
+            new_value = getattr(new_units, field)[new_index]
+            if old_value != new_value:
+                fields[field] = [old_value, new_value]
+        changed.append({'id': _format_id(key), 'fields': fields})
+
+    return {
+        'num_units': [old_uni.num_units, new_uni.num_units],
+        'added': [_format_id(key) for key in new_ids if key not in old_ids],
+        'removed': [_format_id(key) for key in old_ids if key not in new_ids],
+        'changed': changed,
+    }
+
+
+def diff_plt(old_data, new_data, name, expander=None, cache=None):
+    """Diff two PLT members pilot by pilot; slots past the end of the shorter table are added/removed"""
+    PltFile = reader_for_extension('.plt')
+    old_plt = PltFile()
+    old_plt.read_bytes(old_data, name)
+    new_plt = PltFile()
+    new_plt.read_bytes(new_data, name)
+
+    changed = []
+    old_rows = zip(old_plt.usage, old_plt.voice_id, old_plt.photo_id)
+    new_rows = zip(new_plt.usage, new_plt.voice_id, new_plt.photo_id)
+    for index, (old_row, new_row) in enumerate(zip(old_rows, new_rows)):
+        if old_row != new_row:
+            changed.append({'index': index, 'old': list(old_row), 'new': list(new_row)})
+
+    return {
+        'num_pilots': [old_plt.num_pilots, new_plt.num_pilots],
+        'added': list(range(old_plt.num_pilots, new_plt.num_pilots)),
+        'removed': list(range(new_plt.num_pilots, old_plt.num_pilots)),
+        'changed': changed,
+        'callsigns_changed': old_plt.callsign_data != new_plt.callsign_data,
+    }
+
+
+def _format_id(key):
+    return f"{key[0]}:{key[1]}"
+
+
+# Member extension -> record-level diff
+MEMBER_DIFFS = {
+    '.plt': diff_plt,
+    '.uni': diff_uni,
+}
+
+
+def print_diff(report):
+    """Print a short human-readable summary of a diff report"""
+    print(f"Comparing {report['old']} -> {report['new']}")
+    print(f"  {report['unchanged']} unchanged, {len(report['changed'])} changed, "
+          f"{len(report['added'])} added, {len(report['removed'])} removed members")
+    for name in report['added']:
+        print(f"  + {name}")
+    for name in report['removed']:
+        print(f"  - {name}")
+    for name in report['changed']:
+        details = report['members'].get(name)
+        if details is None:
+            print(f"  ~ {name}")
+        elif 'error' in details:
+            print(f"  ~ {name}: {details['error']}")
+        elif 'num_units' in details:
+            print(f"  ~ {name}: {len(details['added'])} units added, {len(details['removed'])} removed, "
+                  f"{len(details['changed'])} changed")
+        else:
+            print(f"  ~ {name}: {len(details['added'])} pilots added, {len(details['removed'])} removed, "
+                  f"{len(details['changed'])} changed "
+                  f"({details['num_pilots'][0]} -> {details['num_pilots'][1]} pilots)")
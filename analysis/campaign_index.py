@@ -0,0 +1,244 @@
+"""
+SQLite index over a history of campaign saves.
+
+Every archive is indexed once: its member hashes are recorded per save,
+and the unit table of each UNI member and the pilot columns of each PLT
+member are stored once per distinct member hash, so a unit list that did
+not change between autosaves is neither decoded nor stored again.
+Re-running update() only looks at archives whose size or mtime changed,
+and drops the rows of member hashes that no save references any more.
+
+    python -m analysis.campaign_index update history.sqlite saves/
+    python -m analysis.campaign_index unit history.sqlite 8006:0
+    python -m analysis.campaign_index pilot history.sqlite 12
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import time
+from extractors.archive_paths import expand_archive_paths
+from extractors.cam_extractor import CamFile
+from readers.registry import reader_for_extension
+from utils.lzsscontext import EXPANDERS
+from utils.member_cache import member_hash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS members (
+    save_id INTEGER NOT NULL REFERENCES saves(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (save_id, name)
+);
+CREATE INDEX IF NOT EXISTS members_hash ON members(hash);
+CREATE TABLE IF NOT EXISTS decoded (
+    hash TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    records INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    hash TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    num INTEGER NOT NULL,
+    creator INTEGER NOT NULL,
+    entity_type INTEGER NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    z REAL NOT NULL,
+    owner INTEGER NOT NULL,
+    PRIMARY KEY (hash, idx)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS units_id ON units(num, creator);
+CREATE TABLE IF NOT EXISTS pilots (
+    hash TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    usage INTEGER NOT NULL,
+    voice_id INTEGER NOT NULL,
+    photo_id INTEGER NOT NULL,
+    PRIMARY KEY (hash, idx)
+) WITHOUT ROWID;
+"""
+
+
+class CampaignIndex:
+    """Incrementally updated SQLite index of units and pilots across saves"""
+
+    def __init__(self, db_path, expander='fast'):
+        self.db_path = db_path
+        self.expander = expander
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(SCHEMA)
+
+    def update(self, archives):
+        """Index new or changed archives; returns counts of added, updated, unchanged and failed saves"""
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
+        for path in archives:
+            path = os.path.abspath(path)
+            try:
+                st = os.stat(path)
+                row = self.db.execute("SELECT id, size, mtime_ns FROM saves WHERE path = ?", (path,)).fetchone()
+                if row is not None and row[1:] == (st.st_size, st.st_mtime_ns):
+                    counts['unchanged'] += 1
+                    continue
+                with self.db:
+                    if row is not None:
+                        self.db.execute("DELETE FROM saves WHERE id = ?", (row[0],))
+                    self._index_save(path, st)
+            except Exception as e:
+                counts['failed'] += 1
+                print(f"Failed to index {path}: {type(e).__name__}: {e}")
+                continue
+            counts['updated' if row is not None else 'added'] += 1
+            print(f"Indexed {path}")
+        if counts['updated']:
+            self.prune()
+        return counts
+
+    def prune(self):
+        """Drop unit and pilot rows of member hashes no indexed save references any more"""
+        with self.db:
+            for table in ('units', 'pilots', 'decoded'):
+                self.db.execute(f"DELETE FROM {table} WHERE hash NOT IN (SELECT hash FROM members)")
+
+    def _index_save(self, path, st):
+        save_id = self.db.execute(
+            "INSERT INTO saves (path, size, mtime_ns, indexed_at) VALUES (?, ?, ?, ?)",
+            (path, st.st_size, st.st_mtime_ns, time.time())).lastrowid
+        with CamFile(path, use_mmap=True) as cam:
+            for info in cam.file_table:
+                data = cam.member_data(info)
+                key = member_hash(data)
+                self.db.execute("INSERT INTO members (save_id, name, hash, size) VALUES (?, ?, ?, ?)",
+                                (save_id, info.filename, key, info.size))
+                extension = os.path.splitext(info.filename)[1].lower()
+                decoder = MEMBER_DECODERS.get(extension)
+                if decoder is None:
+                    continue
+                if self.db.execute("SELECT 1 FROM decoded WHERE hash = ?", (key,)).fetchone():
+                    continue
+                # Readers print progress per member; keep the index output to one line per save
+                with contextlib.redirect_stdout(io.StringIO()):
+                    records = decoder(self, key, data, info.filename)
+                self.db.execute("INSERT INTO decoded (hash, kind, records) VALUES (?, ?, ?)",
+                                (key, extension[1:], records))
+
+    def _decode_uni(self, key, data, name):
+        uni = reader_for_extension('.uni')(expander=self.expander)
+        uni.read_bytes(data, name)
+        units = uni.units
+        if units is None:
+            raise ValueError(f"Could not decompress {name}")
+        self.db.executemany(
+            "INSERT INTO units (hash, idx, num, creator, entity_type, x, y, z, owner) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            zip([key] * len(units), range(len(units)), units.id_num, units.id_creator,
+                units.entity_type, units.x, units.y, units.z, units.owner))
+        return len(units)
+
+    def _decode_plt(self, key, data, name):
+        plt = reader_for_extension('.plt')()
+        plt.read_bytes(data, name)
+        self.db.executemany(
+            "INSERT INTO pilots (hash, idx, usage, voice_id, photo_id) VALUES (?, ?, ?, ?, ?)",
+            zip([key] * plt.num_pilots, range(plt.num_pilots), plt.usage, plt.voice_id, plt.photo_id))
+        return plt.num_pilots
+
+    def saves(self):
+        """(path, size, mtime_ns) of every indexed save, oldest first"""
+        return self.db.execute("SELECT path, size, mtime_ns FROM saves ORDER BY mtime_ns, path").fetchall()
+
+    def unit_history(self, num, creator=0):
+        """One row per save containing the unit: (path, mtime_ns, member, entity_type, x, y, z, owner)"""
+        return self.db.execute(
+            "SELECT s.path, s.mtime_ns, m.name, u.entity_type, u.x, u.y, u.z, u.owner "
+            "FROM units u JOIN members m ON m.hash = u.hash JOIN saves s ON s.id = m.save_id "
+            "WHERE u.num = ? AND u.creator = ? ORDER BY s.mtime_ns, s.path",
+            (num, creator)).fetchall()
+
+    def first_seen(self, num, creator=0):
+        """(path, mtime_ns) of the oldest save containing the unit, or None"""
+        return self.db.execute(
+            "SELECT s.path, s.mtime_ns FROM units u JOIN members m ON m.hash = u.hash "
+            "JOIN saves s ON s.id = m.save_id WHERE u.num = ? AND u.creator = ? "
+            "ORDER BY s.mtime_ns, s.path LIMIT 1",
+            (num, creator)).fetchone()
+
+    def pilot_history(self, index):
+        """One row per save for pilot slot index: (path, mtime_ns, member, usage, voice_id, photo_id)"""
+        return self.db.execute(
+            "SELECT s.path, s.mtime_ns, m.name, p.usage, p.voice_id, p.photo_id "
+            "FROM pilots p JOIN members m ON m.hash = p.hash JOIN saves s ON s.id = m.save_id "
+            "WHERE p.idx = ? ORDER BY s.mtime_ns, s.path",
+            (index,)).fetchall()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Member extension -> method storing its records
+MEMBER_DECODERS = {
+    '.plt': CampaignIndex._decode_plt,
+    '.uni': CampaignIndex._decode_uni,
+}
+
+
+def _format_time(mtime_ns):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(mtime_ns / 1e9))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index campaign saves and query units and pilots across them")
+    commands = parser.add_subparsers(dest="command", required=True)
+    update = commands.add_parser("update", help="Index new or changed archives")
+    update.add_argument("db", help="SQLite index file (created if missing)")
+    update.add_argument("paths", nargs="+", help="Archives, directories or glob patterns")
+    update.add_argument("--expander", choices=sorted(EXPANDERS), default="fast", help="LZSS expand implementation used for UNI members")
+    unit = commands.add_parser("unit", help="Show a unit in every indexed save")
+    unit.add_argument("db")
+    unit.add_argument("id", help="VU_ID as NUM or NUM:CREATOR")
+    pilot = commands.add_parser("pilot", help="Show a pilot slot in every indexed save")
+    pilot.add_argument("db")
+    pilot.add_argument("index", type=int)
+    args = parser.parse_args()
+
+    if args.command == "update":
+        with CampaignIndex(args.db, expander=args.expander) as index:
+            counts = index.update(expand_archive_paths(args.paths))
+        print(f"{counts['added']} added, {counts['updated']} updated, "
+              f"{counts['unchanged']} unchanged, {counts['failed']} failed")
+    elif args.command == "unit":
+        num, _, creator = args.id.partition(':')
+        with CampaignIndex(args.db) as index:
+            rows = index.unit_history(int(num), int(creator or 0))
+        for path, mtime_ns, name, entity_type, x, y, z, owner in rows:
+            print(f"{_format_time(mtime_ns)} {path}:{name} Type={entity_type} "
+                  f"Position=({x}, {y}, {z}) Owner={owner}")
+        print(f"{len(rows)} saves")
+    else:
+        with CampaignIndex(args.db) as index:
+            rows = index.pilot_history(args.index)
+        for path, mtime_ns, name, usage, voice_id, photo_id in rows:
+            print(f"{_format_time(mtime_ns)} {path}:{name} Usage={usage}, Voice ID={voice_id}, Photo ID={photo_id}")
+        print(f"{len(rows)} saves")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark harness for the archive, LZSS and PLT hot paths.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --compare results.json
+    python -m benchmarks.run_benchmarks --verify
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import make_campaign, make_lzss_stream, make_payload, make_plt
+from benchmarks.verify import run_checks
+from extractors.cam_extractor import CamFile
+from readers.plt_reader import PltFile
+from utils.lzss import decompress, decompress_fast
+from utils.lzsscontext import EXPANDERS, lzss_compress
+
+
+def measure(func, repeat):
+    """Best wall time of repeat calls to func"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def quietly(func):
+    """Wrap func so anything it prints is discarded"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+    return run
+
+
+def bench_archive(results, workdir, repeat, num_members, member_size):
+    path = os.path.join(workdir, 'bench.cam')
+    with open(path, 'wb') as f:
+        f.write(make_campaign(num_members=num_members, member_size=member_size))
+    size = os.path.getsize(path)
+    params = {'members': num_members, 'member_size': member_size, 'archive_size': size}
+
+    for use_mmap in (False, True):
+        def load():
+            cam = CamFile(path, use_mmap=use_mmap)
+            cam.load()
+            cam.close()
+        results.append(result(f"CamFile.load[mmap={use_mmap}]", params, measure(load, repeat), size))
+
+        def extract():
+            cam = CamFile(path, use_mmap=use_mmap)
+            cam.load()
+            cam.extract_all(os.path.join(workdir, 'extract'))
+            cam.close()
+        results.append(result(f"CamFile.extract_all[mmap={use_mmap}]", params, measure(quietly(extract), repeat), size))
+
+
+def bench_lzss(results, repeat, size, compressibility):
+    payload = make_payload(size, compressibility)
+    start = time.perf_counter()
+    compressed = lzss_compress(payload)
+    compress_seconds = time.perf_counter() - start
+    params = {'size': size, 'compressibility': compressibility, 'compressed_size': len(compressed)}
+
+    results.append(result("lzss_compress", params, compress_seconds, size))
+    for name, expander in sorted(EXPANDERS.items()):
+        results.append(result(f"lzss_expand[{name}]", params,
+                              measure(lambda: expander(compressed, size), repeat), size))
+
+    # utils.lzss reads a different stream layout, so it gets its own valid stream
+    stream = make_lzss_stream(size, compressibility)
+    params = {'size': size, 'compressibility': compressibility, 'compressed_size': len(stream)}
+    results.append(result("utils.lzss.decompress", params,
+                          measure(quietly(lambda: decompress(stream, size)), repeat), size))
+    results.append(result("utils.lzss.decompress_fast", params,
+                          measure(lambda: decompress_fast(stream, size), repeat), size))
+
+
+def bench_plt(results, workdir, repeat, num_pilots):
+    path = os.path.join(workdir, 'bench.plt')
+    data = make_plt(num_pilots)
+    with open(path, 'wb') as f:
+        f.write(data)
+    params = {'pilots': num_pilots}
+
+    results.append(result("PltFile.read", params, measure(lambda: PltFile(path), repeat), len(data)))
+    plt = PltFile(path)
+    out_path = os.path.join(workdir, 'bench_out.plt')
+    results.append(result("PltFile.write", params, measure(lambda: plt.write(out_path), repeat), len(data)))
+
+
+def result(name, params, seconds, size):
+    return {
+        'name': name,
+        'params': params,
+        'seconds': seconds,
+        'mb_per_s': size / seconds / 1e6 if seconds else None,
+    }
+
+
+def compare(results, baseline_path):
+    """Print speed ratios against a previous results file"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r['name'], json.dumps(r['params'], sort_keys=True)): r for r in baseline['results']}
+    print(f"\nCompared with {baseline_path}:")
+    for r in results:
+        old = previous.get((r['name'], json.dumps(r['params'], sort_keys=True)))
+        if old:
+            print(f"  {r['name']:40s} {old['seconds'] / r['seconds']:6.2f}x  ({old['seconds']:.4f}s -> {r['seconds']:.4f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark camreader hot paths on synthetic data")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark; the best is kept")
+    parser.add_argument("--members", type=int, default=200, help="Members per synthetic archive")
+    parser.add_argument("--member-size", type=int, default=64 * 1024, help="Size of filler members")
+    parser.add_argument("--uni-size", type=int, nargs="+", default=[64 * 1024, 1024 * 1024],
+                        help="Decompressed UNI payload sizes")
+    parser.add_argument("--compressibility", type=float, nargs="+", default=[0.2, 0.8],
+                        help="Fractions of repeated data in UNI payloads")
+    parser.add_argument("--pilots", type=int, nargs="+", default=[800, 20000], help="Pilots per PLT file")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check the optimised LZSS code against the reference decoders instead of timing")
+    parser.add_argument("--rounds", type=int, default=500, help="Random streams per --verify check")
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(0 if run_checks(args.rounds) else 1)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        bench_archive(results, workdir, args.repeat, args.members, args.member_size)
+        for size in args.uni_size:
+            for compressibility in args.compressibility:
+                bench_lzss(results, args.repeat, size, compressibility)
+        for num_pilots in args.pilots:
+            bench_plt(results, workdir, args.repeat, num_pilots)
+
+    for r in results:
+        throughput = f"{r['mb_per_s']:8.1f} MB/s" if r['mb_per_s'] else ""
+        print(f"{r['name']:40s} {r['seconds']:10.4f}s {throughput}  {r['params']}")
+
+    report = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
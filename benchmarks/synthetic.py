@@ -0,0 +1,98 @@
+"""
+Synthetic CAM/TAC, UNI and PLT data for benchmarks
+"""
+
+import random
+import struct
+
+from utils.lzsscontext import lzss_compress
+
+
+def make_payload(size, compressibility=0.5, seed=0):
+    """Random bytes where roughly `compressibility` of the output repeats earlier data.
+
+    Repeats are copied from within the last 4 KB so the LZSS window can
+    find them; 0.0 gives incompressible noise, 1.0 long repeated runs.
+    """
+    rnd = random.Random(seed)
+    data = bytearray(rnd.randbytes(min(size, 16)))
+    while len(data) < size:
+        length = rnd.randint(3, 24)
+        if data and rnd.random() < compressibility:
+            start = max(0, len(data) - 4000)
+            src = rnd.randrange(start, len(data))
+            chunk = data[src:src + length]
+        else:
+            chunk = rnd.randbytes(length)
+        data += chunk
+    return bytes(data[:size])
+
+
+def make_lzss_stream(size, compressibility=0.5, seed=0):
+    """A valid stream in the layout utils.lzss.decompress reads, decoding to `size` bytes.
+
+    Flags are read MSB first (1 = literal); a match is 12 bits of
+    distance and 4 bits of length - 3. Distances are never shorter than
+    the match, so decompress copies every byte and never falls back to
+    its zero placeholders. About `compressibility` of the tokens are matches.
+    """
+    rnd = random.Random(seed)
+    stream = bytearray()
+    produced = 0
+    while produced < size:
+        flag_pos = len(stream)
+        stream.append(0)
+        for bit in range(8):
+            if produced >= size:
+                break
+            length = min(rnd.randint(3, 18), size - produced)
+            if length >= 3 and produced >= length and rnd.random() < compressibility:
+                distance = rnd.randint(length, min(produced, 4095))
+                stream += bytes((distance >> 4, (distance & 0x0F) << 4 | (length - 3)))
+                produced += length
+            else:
+                stream[flag_pos] |= 0x80 >> bit
+                stream.append(rnd.getrandbits(8))
+                produced += 1
+    return bytes(stream)
+
+
+def make_uni(payload, num_units=0):
+    """Build a UNI file: size, numUnits and decompressed size header, then LZSS data"""
+    compressed = lzss_compress(payload)
+    return struct.pack('<ihi', 6 + len(compressed), num_units, len(payload)) + compressed
+
+
+def make_plt(num_pilots, num_callsigns=169, seed=0):
+    """Build a PLT file with num_pilots random pilot records"""
+    rnd = random.Random(seed)
+    records = b''.join(struct.pack('<hBB', rnd.randint(0, 3), rnd.randrange(16), rnd.randrange(256))
+                       for _ in range(num_pilots))
+    return (struct.pack('<h', num_pilots) + records +
+            struct.pack('<h', num_callsigns) + rnd.randbytes(num_callsigns))
+
+
+def make_archive(members):
+    """Build a CAM/TAC archive from (name, data) pairs"""
+    parts = [b'\0\0\0\0']
+    offset = 4
+    directory = [struct.pack('<I', len(members))]
+    for name, data in members:
+        encoded = name.encode('ascii')
+        directory.append(struct.pack('<B', len(encoded)) + encoded + struct.pack('<II', offset, len(data)))
+        parts.append(data)
+        offset += len(data)
+    parts[0] = struct.pack('<I', offset)
+    return b''.join(parts + directory)
+
+
+def make_campaign(name='bench', num_members=10, member_size=4096, uni_size=65536,
+                  compressibility=0.5, num_pilots=800, seed=0):
+    """Build an archive resembling a campaign save: one UNI, one PLT and filler members"""
+    members = [
+        (f"{name}.uni", make_uni(make_payload(uni_size, compressibility, seed), num_units=uni_size // 512)),
+        (f"{name}.plt", make_plt(num_pilots, seed=seed)),
+    ]
+    for i in range(max(num_members - len(members), 0)):
+        members.append((f"{name}.{i:03d}", make_payload(member_size, compressibility, seed + i + 1)))
+    return make_archive(members)
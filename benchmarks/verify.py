@@ -0,0 +1,101 @@
+"""
+Cross-checks of the optimised LZSS code against the reference decoders.
+
+lzss_expand_fast, LZSSDecoder/iter_expand and lzss_compress are checked
+against lzss_expand, and utils.lzss.decompress_fast against decompress,
+on random and synthetic streams. Each check returns
+a list of failure descriptions (empty when everything matches). Run with
+
+    python -m benchmarks.run_benchmarks --verify
+"""
+
+import contextlib
+import io
+import random
+
+from benchmarks.synthetic import make_lzss_stream, make_payload
+from utils.lzss import decompress, decompress_fast
+from utils.lzsscontext import iter_expand, lzss_compress, lzss_expand, lzss_expand_fast
+
+
+def _chunks(rnd, data):
+    """Split data at random points, including empty chunks"""
+    chunks = []
+    pos = 0
+    while pos < len(data):
+        size = rnd.randint(0, 64)
+        chunks.append(data[pos:pos + size])
+        pos += size
+    return chunks
+
+
+def verify_lzsscontext(rounds=500, seed=0):
+    """Check the fast and streaming expanders and the compressor against lzss_expand"""
+    rnd = random.Random(seed)
+    failures = []
+    for round_ in range(rounds):
+        payload = make_payload(rnd.randint(0, 20000), rnd.random(), seed=round_)
+        compressed = lzss_compress(payload)
+        if lzss_expand(compressed, len(payload)) != payload:
+            failures.append(f"lzss_compress round trip, round {round_}")
+        if lzss_expand_fast(compressed, len(payload)) != payload:
+            failures.append(f"lzss_expand_fast on compressed payload, round {round_}")
+        if b''.join(iter_expand(iter(_chunks(rnd, compressed)), len(payload))) != payload:
+            failures.append(f"iter_expand on compressed payload, round {round_}")
+
+        # Random streams exercise truncation and arbitrary window positions
+        data = rnd.randbytes(rnd.randint(1, 300))
+        size = rnd.randint(0, 600)
+        try:
+            expected = lzss_expand(data, size)
+        except IndexError:
+            continue  # The reference cannot decode it either
+        if lzss_expand_fast(data, size) != expected:
+            failures.append(f"lzss_expand_fast on random stream, round {round_}")
+        if b''.join(iter_expand(iter(_chunks(rnd, data)), size)) != expected:
+            failures.append(f"iter_expand on random stream, round {round_}")
+    return failures
+
+
+def verify_lzss(rounds=500, seed=0):
+    """Check decompress_fast against decompress, output and diagnostics"""
+    rnd = random.Random(seed)
+    failures = []
+    for round_ in range(rounds):
+        size = rnd.randint(0, 5000)
+        valid = make_lzss_stream(size, rnd.random(), seed=round_)
+        # Random bytes hit invalid references, placeholders and truncation
+        corrupt = rnd.randbytes(rnd.randint(0, 400))
+        for kind, data, data_size in (('valid', valid, size), ('random', corrupt, rnd.randint(0, 800))):
+            warnings = io.StringIO()
+            with contextlib.redirect_stdout(warnings):
+                expected = decompress(data, data_size)
+            result, diagnostics = decompress_fast(memoryview(data), data_size)
+            if result != expected:
+                failures.append(f"decompress_fast output on {kind} stream, round {round_}")
+            flagged = bool(diagnostics.invalid_references or diagnostics.placeholder_bytes)
+            if flagged != bool(warnings.getvalue()):
+                failures.append(f"decompress_fast diagnostics disagree with decompress warnings on "
+                                f"{kind} stream, round {round_}")
+            if kind == 'valid' and not diagnostics.ok:
+                failures.append(f"decompress_fast flagged a valid stream, round {round_}")
+    return failures
+
+
+# Name -> check, run in order by --verify
+CHECKS = {
+    'lzsscontext': verify_lzsscontext,
+    'lzss': verify_lzss,
+}
+
+
+def run_checks(rounds=500, seed=0):
+    """Run every check, print a line per check and return True if all passed"""
+    ok = True
+    for name, check in CHECKS.items():
+        failures = check(rounds, seed)
+        print(f"{name:16s} {'ok' if not failures else f'{len(failures)} FAILED'}")
+        for failure in failures[:20]:
+            print(f"  {failure}")
+        ok = ok and not failures
+    return ok
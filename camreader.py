@@ -1,81 +1,550 @@
 import argparse
+import contextlib
+import io
+import json
 import os
+import signal
 import sys
-from extractors.cam_extractor import CamFile
-from readers.plt_reader import PltFile
-from readers.uni_reader import UniFile
-
-def process_plt_files(output_dir):
-    """Process .plt files in the output directory"""
-    plt_files = []
-    for root, _, files in os.walk(output_dir):
-        for file in files:
-            if file.endswith('.plt'):
-                plt_files.append(os.path.join(root, file))
-    
-    if not plt_files:
-        print("No .plt files found")
-        return
-    
-    for plt_file_path in plt_files:
-        print(f"\nProcessing {plt_file_path}:")
-        plt = PltFile(plt_file_path)
-        
-        # Print data in sections to avoid truncation
-        print(f"Number of pilots: {plt.num_pilots}")
-        print(f"Pilot information:")
-        for i, pilot in enumerate(plt.pilot_info):
-            if i < 20 or i > plt.num_pilots - 5:  # Print first 20 and last 5
-                print(f"  Pilot {i+1}: Usage={pilot.usage}, Voice ID={pilot.voice_id}, Photo ID={pilot.photo_id}")
-            elif i == 20:
-                print(f"  ... {plt.num_pilots - 25} more pilots ...")
-        
-        print(f"Number of callsigns: {plt.num_callsigns}")
-        
-        # Save complete data to a text file
-        output_file = plt_file_path + '.txt'
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from extractors.archive_paths import expand_archive_paths
+from extractors.cam_extractor import CamFile, EmbeddedFileInfo
+from readers.base_reader import EXPORT_FORMATS, EXPORT_SUFFIXES
+from readers.registry import READERS, get_reader, reader_for_extension
+from utils import stats
+from utils.lzsscontext import EXPANDERS
+from utils.member_cache import MemberCache, member_hash
+
+ARTIFACTS = ('members', 'plt.txt', 'uni.dec', 'uni.map', 'units')
+DEFAULT_ARTIFACTS = ('plt.txt', 'uni.dec')
+DEFAULT_CACHE_SIZE = 512 * 1024 * 1024
+INDEX_FILENAME = 'campaign_index.sqlite'
+WATCH_STATE_FILENAME = 'watch_state.json'
+
+def process_plt_data(data, filepath, output_file=None, cache=None, export_format='text'):
+    """Parse PLT data, print a summary and export the complete data to output_file.
+    
+    With a cache, an unchanged member is not parsed at all: its summary
+    and its export are both restored from the cache.
+    """
+    cache_kind = 'plt' + EXPORT_SUFFIXES[export_format]
+    cache_key = cache.key(data) if cache is not None and output_file else None
+    if cache_key is not None:
+        summary = cache.get(cache_key, 'plt.summary')
+        if summary is not None and cache.copy_to(cache_key, cache_kind, output_file):
+            stats.count('cache.hits')
+            print(summary.decode(), end='')
+            print(f"Complete data restored from cache to {output_file}")
+            return
+    
+    plt = reader_for_extension('.plt')()
+    plt.read_bytes(data, filepath)
+    summary = io.StringIO()
+    with contextlib.redirect_stdout(summary):
+        report_plt(plt)
+    print(summary.getvalue(), end='')
+    
+    if output_file:
+        # Stream the complete data to a file
+        started = stats.start()
+        with open(output_file, 'w') as f:
+            plt.export(f, export_format)
+        stats.record('plt.export', started)
+        print(f"Complete data saved to {output_file}")
+        if cache_key is not None:
+            cache.put_file(cache_key, cache_kind, output_file)
+            cache.put(cache_key, 'plt.summary', summary.getvalue().encode())
+
+def report_plt(plt):
+    """Print a PLT summary"""
+    # Print data in sections to avoid truncation
+    print(f"Number of pilots: {plt.num_pilots}")
+    print(f"Pilot information:")
+    # Print first 20 and last 4 via pilot(i), so the columnar table is never expanded
+    num_pilots = plt.num_pilots
+    for i in range(min(num_pilots, 20)):
+        _print_pilot(plt, i)
+    if num_pilots - 4 > 20:
+        print(f"  ... {num_pilots - 25} more pilots ...")
+    for i in range(max(20, num_pilots - 4), num_pilots):
+        _print_pilot(plt, i)
+    
+    print(f"Number of callsigns: {plt.num_callsigns}")
+
+def _print_pilot(plt, i):
+    pilot = plt.pilot(i)
+    print(f"  Pilot {i+1}: Usage={pilot.usage}, Voice ID={pilot.voice_id}, Photo ID={pilot.photo_id}")
+
+def _process_plt_member(info, data, output_dir, options):
+    print(f"\nProcessing {info.filename}:")
+    output_file = None
+    if 'plt.txt' in options['artifacts']:
+        output_file = os.path.join(output_dir, info.filename + EXPORT_SUFFIXES[options['export_format']])
+    process_plt_data(data, info.filename, output_file, cache=options['cache'],
+                     export_format=options['export_format'])
+
+def _process_uni_member(info, data, output_dir, options):
+    print(f"\nProcessing {info.filename}:")
+    try:
+        uni = reader_for_extension('.uni')(expander=options['expander'], cache=options['cache'])
+        uni.read_bytes(data, info.filename)
+        if 'uni.dec' in options['artifacts']:
+            uni.save_decompressed(output_dir)
+        if 'uni.map' in options['artifacts']:
+            uni.save_mapped(output_dir)
+        if 'units' in options['artifacts']:
+            output_file = os.path.join(output_dir, info.filename + '.units' + EXPORT_SUFFIXES[options['export_format']])
+            with open(output_file, 'w') as f:
+                uni.export(f, options['export_format'])
+            print(f"Unit table saved to {output_file}")
+    except Exception as e:
+        print(f"Error processing {info.filename}: {e}")
+
+def _process_registered_member(info, data, output_dir, options):
+    """Export a member that has a registered reader but no dedicated handler"""
+    print(f"\nProcessing {info.filename}:")
+    try:
+        reader = get_reader(info.filename)()
+        reader.read_bytes(data, info.filename)
+        output_file = os.path.join(output_dir, info.filename + EXPORT_SUFFIXES[options['export_format']])
         with open(output_file, 'w') as f:
-            f.write(str(plt))
+            reader.export(f, options['export_format'])
         print(f"Complete data saved to {output_file}")
+    except Exception as e:
+        print(f"Error processing {info.filename}: {e}")
+
+# Member extension -> handler used by the in-memory pipeline. Extensions
+# registered in readers.registry without an entry here get a plain export.
+MEMBER_PROCESSORS = {
+    '.plt': _process_plt_member,
+    '.uni': _process_uni_member,
+}
 
-def process_uni_files(output_dir):
-    """Process .uni files in the output directory"""
-    uni_files = []
-    for root, _, files in os.walk(output_dir):
-        for file in files:
-            if file.endswith('.uni'):
-                uni_files.append(os.path.join(root, file))
+def member_processors():
+    """Extension -> handler for every registered reader, so dispatch is a single lookup"""
+    processors = dict.fromkeys(READERS, _process_registered_member)
+    processors.update(MEMBER_PROCESSORS)
+    return processors
+
+def process_members(cam, output_dir, artifacts=DEFAULT_ARTIFACTS, expander='fast', cache=None,
+                    export_format='text', members=None):
+    """Hand every member of a loaded archive (or just `members`) straight to its reader.
     
-    if not uni_files:
-        print("No .uni files found")
-        return
+    Nothing is extracted first; only the requested artifacts are written
+    ('members' writes the raw member files as extract_all would).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    options = {'artifacts': artifacts, 'expander': expander, 'cache': cache, 'export_format': export_format}
+    processors = member_processors()
+    for info in cam.file_table if members is None else members:
+        data = cam.member_data(info)
+        if 'members' in artifacts:
+            output_path = os.path.join(output_dir, info.filename)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            with open(output_path, 'wb') as out_file:
+                out_file.write(data)
+            print(f"Extracted: {info.filename}")
+        processor = processors.get(os.path.splitext(info.filename)[1].lower())
+        if processor:
+            processor(info, data, output_dir, options)
+            stats.count('members.processed')
+
+def process_extracted_files(output_dir, artifacts=DEFAULT_ARTIFACTS, expander='fast', cache=None,
+                            export_format='text'):
+    """Hand every extracted file with a registered reader to its handler.
     
-    print(f"Found {len(uni_files)} UNI files to process")
+    Uses the same extension -> handler table as process_members: one walk
+    of output_dir and one dict lookup per file.
+    """
+    processors = member_processors()
+    options = {'artifacts': artifacts, 'expander': expander, 'cache': cache, 'export_format': export_format}
+    paths = [os.path.join(root, file) for root, _, files in os.walk(output_dir) for file in files]
+    processed = 0
+    for path in paths:
+        processor = processors.get(os.path.splitext(path)[1].lower())
+        if processor is None:
+            continue
+        with open(path, 'rb') as f:
+            data = f.read()
+        info = EmbeddedFileInfo(os.path.relpath(path, output_dir), 0, len(data))
+        processor(info, data, output_dir, options)
+        stats.count('members.processed')
+        processed += 1
+    if not processed:
+        print("No files with a registered reader found")
+
+def process_archive(camfile, outdir, process=False, use_mmap=False, expander='fast',
+                    in_memory=False, artifacts=DEFAULT_ARTIFACTS, cache_dir=None, cache_size=DEFAULT_CACHE_SIZE,
+                    export_format='text', only=None, write_concurrency=None, fsync=False):
+    """Extract one archive and optionally process its members; returns a small summary.
+    
+    `only` restricts the work to members matching the given names or glob
+    patterns; the archive is then memory-mapped so other members are never read.
+    With write_concurrency, members are extracted through the async writer.
+    """
+    cache = MemberCache(cache_dir, cache_size) if cache_dir else None
+    cam = CamFile(camfile, use_mmap=use_mmap or bool(only))
+    cam.load()
+    try:
+        members = cam.find(only) if only else cam.file_table
+    except KeyError:
+        cam.close()
+        raise
+    summary = {
+        'members': len(members),
+        'bytes': sum(f.size for f in members),
+    }
+    if in_memory:
+        process_members(cam, outdir, artifacts=artifacts, expander=expander, cache=cache,
+                        export_format=export_format, members=members)
+        cam.close()
+        return summary
     
-    for uni_file_path in uni_files:
-        print(f"\nProcessing {uni_file_path}:")
+    if write_concurrency and only:
+        cam.extract_async(only, outdir, write_concurrency, fsync)
+    elif write_concurrency:
+        cam.extract_all_async(outdir, write_concurrency, fsync)
+    elif only:
+        cam.extract(only, outdir)
+    else:
+        cam.extract_all(outdir)
+    cam.close()
+    
+    if process:
+        # Process files based on their types
+        process_extracted_files(outdir, expander=expander, cache=cache, export_format=export_format)
+    return summary
+
+def batch_output_dirs(archives, outdir, used=None):
+    """Give every archive its own output sub-directory named after it.
+    
+    `used` holds sub-directory names already taken; new names are added to it.
+    """
+    used = set() if used is None else used
+    output_dirs = {}
+    for archive in archives:
+        name = os.path.splitext(os.path.basename(archive))[0]
+        candidate = name
+        suffix = 2
+        while candidate in used:
+            candidate = f"{name}_{suffix}"
+            suffix += 1
+        used.add(candidate)
+        output_dirs[archive] = os.path.join(outdir, candidate)
+    return output_dirs
+
+def _batch_worker(camfile, outdir, options, collect_stats=False):
+    """Run process_archive in a worker process and report the outcome instead of raising"""
+    result = {'archive': camfile, 'outdir': outdir, 'ok': False, 'error': None,
+              'members': 0, 'bytes': 0, 'seconds': 0.0}
+    worker_stats = stats.enable() if collect_stats else None
+    start = time.perf_counter()
+    try:
+        # Readers print progress per member; keep worker output out of the shared console
+        with contextlib.redirect_stdout(io.StringIO()):
+            result.update(process_archive(camfile, outdir, **options))
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - start
+    if worker_stats is not None:
+        stats.disable()
+        result['stats'] = worker_stats.to_dict()
+    return result
+
+def run_batch(archives, outdir, jobs=None, collect_stats=False, **options):
+    """Extract/process many archives in parallel and return one result per archive.
+    
+    With collect_stats, every worker's stage timings are merged into the
+    active Stats of this process.
+    """
+    output_dirs = batch_output_dirs(archives, outdir)
+    os.makedirs(outdir, exist_ok=True)
+    start = time.perf_counter()
+    results = []
+    
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(_batch_worker, archive, output_dirs[archive], options, collect_stats): archive
+                   for archive in archives}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. BrokenProcessPool)
+                archive = futures[future]
+                result = {'archive': archive, 'outdir': output_dirs[archive], 'ok': False,
+                          'error': f"{type(e).__name__}: {e}", 'members': 0, 'bytes': 0, 'seconds': 0.0}
+            if 'stats' in result and stats.active() is not None:
+                stats.active().merge(result['stats'])
+            results.append(result)
+            status = "ok" if result['ok'] else f"FAILED ({result['error']})"
+            print(f"[{len(results)}/{len(archives)}] {result['archive']}: {status}")
+    
+    results.sort(key=lambda r: r['archive'])
+    summary = {
+        'archives': len(results),
+        'succeeded': sum(1 for r in results if r['ok']),
+        'failed': sum(1 for r in results if not r['ok']),
+        'members': sum(r['members'] for r in results),
+        'bytes': sum(r['bytes'] for r in results),
+        'seconds': time.perf_counter() - start,
+        'results': results,
+    }
+    summary_path = os.path.join(outdir, 'batch_summary.json')
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    
+    print(f"\nProcessed {summary['archives']} archives in {summary['seconds']:.2f}s: "
+          f"{summary['succeeded']} succeeded, {summary['failed']} failed")
+    for r in results:
+        if not r['ok']:
+            print(f"  {r['archive']}: {r['error']}")
+    print(f"Summary saved to {summary_path}")
+    return summary
+
+# Per-process state of watch-mode workers, set up once by _warm_worker
+_worker_cache = None
+
+def _warm_worker(cache_dir=None, cache_size=DEFAULT_CACHE_SIZE):
+    """Pool initializer: import every registered reader and open the member cache once per worker"""
+    global _worker_cache
+    # Ctrl+C is handled by the watching process, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for extension in READERS:
+        reader_for_extension(extension)
+    _worker_cache = MemberCache(cache_dir, cache_size) if cache_dir else None
+
+def _watch_worker(camfile, outdir, options, previous_hashes, collect_stats=False):
+    """Process the members of camfile whose hashes differ from previous_hashes.
+    
+    Runs in a warm pool worker; reports the outcome and the new member
+    hashes instead of raising.
+    """
+    result = {'archive': camfile, 'outdir': outdir, 'ok': False, 'error': None,
+              'members': 0, 'processed': 0, 'seconds': 0.0, 'hashes': {}}
+    worker_stats = stats.enable() if collect_stats else None
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), CamFile(camfile, use_mmap=True) as cam:
+            members = cam.find(options['only']) if options['only'] else cam.file_table
+            hashes = {info.filename: member_hash(cam.member_data(info)) for info in members}
+            changed = [info for info in members if previous_hashes.get(info.filename) != hashes[info.filename]]
+            process_members(cam, outdir, artifacts=options['artifacts'], expander=options['expander'],
+                            cache=_worker_cache, export_format=options['export_format'], members=changed)
+        result.update(ok=True, members=len(members), processed=len(changed), hashes=hashes)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - start
+    if worker_stats is not None:
+        stats.disable()
+        result['stats'] = worker_stats.to_dict()
+    return result
+
+def _save_watch_state(state_path, state):
+    """Replace the watch state file atomically, so a crash never leaves it half written"""
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, state_path)
+
+def run_watch(patterns, outdir, jobs=None, interval=2.0, collect_stats=False, **options):
+    """Poll for new or changed archives and process their changed members until interrupted.
+    
+    An archive is picked up once its size and mtime have not changed for
+    at least `interval` seconds, so files still being written are left alone. Work goes
+    to a pool of workers started once, with readers already imported.
+    Processed archives, their output directories and member hashes are
+    kept in outdir/watch_state.json, so a restart only handles what changed
+    and keeps writing every archive to the same directory. With
+    collect_stats, every worker's stage timings are merged into the active
+    Stats of this process.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    state_path = os.path.join(outdir, WATCH_STATE_FILENAME)
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            state = json.load(f)
+    output_dirs = {path: entry['outdir'] for path, entry in state.items() if 'outdir' in entry}
+    used = {os.path.basename(path) for path in output_dirs.values()}
+    settling = {}
+    running = {}
+
+    print(f"Watching {', '.join(patterns)} every {interval}s (Ctrl+C to stop)")
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_warm_worker,
+                             initargs=(options['cache_dir'], options['cache_size'])) as executor:
         try:
-            uni = UniFile(uni_file_path)
-            uni.save_decompressed(output_dir)
-        except Exception as e:
-            print(f"Error processing {uni_file_path}: {e}")
+            while True:
+                busy = {path for path, _ in running.values()}
+                for path in expand_archive_paths(patterns):
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    signature = [st.st_size, st.st_mtime_ns]
+                    known = state.get(path)
+                    if path in busy or (known and known['signature'] == signature):
+                        continue
+                    first_seen = settling.get(path)
+                    if first_seen is None or first_seen[0] != signature:
+                        # New or still growing; look again on a later poll
+                        settling[path] = (signature, time.monotonic())
+                        continue
+                    if time.monotonic() - first_seen[1] < interval:
+                        continue
+                    del settling[path]
+                    if path not in output_dirs:
+                        output_dirs.update(batch_output_dirs([path], outdir, used))
+                    previous = known['hashes'] if known else {}
+                    future = executor.submit(_watch_worker, path, output_dirs[path], options, previous,
+                                             collect_stats)
+                    running[future] = (path, signature)
+
+                if not running:
+                    time.sleep(interval)
+                    continue
+                finished, _ = wait(running, timeout=interval, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    path, signature = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                    if 'stats' in result and stats.active() is not None:
+                        stats.active().merge(result['stats'])
+                    if result['ok']:
+                        state[path] = {'signature': signature, 'outdir': output_dirs[path],
+                                       'hashes': result['hashes']}
+                        print(f"{path}: {result['processed']} of {result['members']} members changed, "
+                              f"processed in {result['seconds']:.2f}s")
+                    else:
+                        # Not retried until the file changes again
+                        state[path] = {'signature': signature, 'outdir': output_dirs[path],
+                                       'hashes': state.get(path, {}).get('hashes', {})}
+                        print(f"{path}: FAILED ({result['error']})")
+                    _save_watch_state(state_path, state)
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def run_diff(old_camfile, camfile, outdir, expander='fast', cache_dir=None, cache_size=DEFAULT_CACHE_SIZE):
+    """Diff two saves, print a summary and save the full report as JSON"""
+    from analysis.cam_diff import diff_archives, print_diff
+    cache = MemberCache(cache_dir, cache_size) if cache_dir else None
+    report = diff_archives(old_camfile, camfile, expander=expander, cache=cache)
+    print_diff(report)
+    
+    os.makedirs(outdir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(camfile))[0]
+    report_path = os.path.join(outdir, f"{name}.diff.json")
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Diff saved to {report_path}")
+    return report
+
+def run_index(archives, outdir, expander='fast'):
+    """Add new or changed archives to the campaign index in outdir"""
+    from analysis.campaign_index import CampaignIndex
+    os.makedirs(outdir, exist_ok=True)
+    db_path = os.path.join(outdir, INDEX_FILENAME)
+    with CampaignIndex(db_path, expander=expander) as index:
+        counts = index.update(archives)
+    print(f"{counts['added']} added, {counts['updated']} updated, {counts['unchanged']} unchanged, "
+          f"{counts['failed']} failed; index saved to {db_path}")
+    return counts
 
 def main():
     parser = argparse.ArgumentParser(description="Unpack .cam files from Falcon BMS")
-    parser.add_argument("camfile", help="Path to .cam file")
+    parser.add_argument("camfile", nargs="+",
+                        help="Path to .cam file; several paths, directories or glob patterns run a batch")
     parser.add_argument("outdir", help="Output directory for extracted files")
     parser.add_argument("--process", action="store_true", help="Process extracted files")
+    parser.add_argument("--mmap", action="store_true", help="Memory-map the archive instead of reading it into memory")
+    parser.add_argument("--expander", choices=sorted(EXPANDERS), default="fast",
+                        help="LZSS expand implementation used for UNI files")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Worker processes for batch mode (default: number of CPUs)")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="Process members straight from the archive without extracting them first (implies --process)")
+    parser.add_argument("--artifacts", default=",".join(DEFAULT_ARTIFACTS),
+                        help=f"Comma-separated outputs written in --in-memory mode, from: {', '.join(ARTIFACTS)}")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directory for a content-addressed cache of decompressed/parsed members")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE // (1024 * 1024),
+                        help="Maximum cache size in MB; least recently used entries are evicted (default: %(default)s)")
+    parser.add_argument("--export-format", choices=EXPORT_FORMATS, default="text",
+                        help="Format of the PLT dump and unit table exports (default: text)")
+    parser.add_argument("--only", action="append", metavar="PATTERN",
+                        help="Only extract/process members matching this name or glob (repeatable)")
+    parser.add_argument("--diff", metavar="OLD_ARCHIVE",
+                        help="Compare camfile against an older save and write <name>.diff.json to outdir")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep polling the given directories/patterns and process new or changed archives as they appear")
+    parser.add_argument("--poll-interval", type=float, default=2.0, metavar="SECONDS",
+                        help="Seconds between polls in --watch mode (default: %(default)s)")
+    parser.add_argument("--index", action="store_true",
+                        help="Index units and pilots of every archive into outdir/campaign_index.sqlite instead of extracting")
+    parser.add_argument("--write-concurrency", type=int, default=None, metavar="N",
+                        help="Extract members with up to N writes in flight (helps on network file systems)")
+    parser.add_argument("--fsync", action="store_true",
+                        help="With --write-concurrency, flush extracted files to disk once all writes are done")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print per-stage timings, byte counts and throughput when done")
+    parser.add_argument("--stats-json", metavar="PATH", help="Write per-stage timings and counters as JSON")
     args = parser.parse_args()
 
-    cam = CamFile(args.camfile)
-    cam.load()
-    cam.extract_all(args.outdir)
-    
-    if args.process:
-        # Process files based on their types
-        process_plt_files(args.outdir)
-        process_uni_files(args.outdir)
+    artifacts = tuple(a for a in args.artifacts.split(",") if a)
+    unknown = [a for a in artifacts if a not in ARTIFACTS]
+    if unknown:
+        parser.error(f"Unknown artifacts: {', '.join(unknown)} (choose from {', '.join(ARTIFACTS)})")
+
+    archives = expand_archive_paths(args.camfile)
+    if not archives and not args.watch:
+        parser.error(f"No archives found for {' '.join(args.camfile)}")
+    options = {'process': args.process, 'use_mmap': args.mmap, 'expander': args.expander,
+               'in_memory': args.in_memory, 'artifacts': artifacts,
+               'cache_dir': args.cache_dir, 'cache_size': args.cache_size * 1024 * 1024,
+               'export_format': args.export_format, 'only': args.only,
+               'write_concurrency': args.write_concurrency, 'fsync': args.fsync}
+
+    profiling = args.profile or args.stats_json
+    run_stats = stats.enable() if profiling else None
+    started = time.perf_counter()
+    failed = False
+
+    if args.watch:
+        run_watch(args.camfile, args.outdir, jobs=args.jobs, interval=args.poll_interval,
+                  collect_stats=bool(profiling), **options)
+    elif args.diff:
+        if len(archives) != 1:
+            parser.error("--diff compares exactly one archive against OLD_ARCHIVE")
+        run_diff(args.diff, archives[0], args.outdir, expander=args.expander,
+                 cache_dir=args.cache_dir, cache_size=options['cache_size'])
+    elif args.index:
+        run_index(archives, args.outdir, expander=args.expander)
+    elif len(archives) > 1 or args.jobs:
+        # Batch mode: each archive goes to its own sub-directory of outdir
+        summary = run_batch(archives, args.outdir, jobs=args.jobs, collect_stats=bool(profiling), **options)
+        failed = summary['failed'] > 0
+    else:
+        try:
+            process_archive(archives[0], args.outdir, **options)
+        except KeyError as e:
+            # --only named a member the archive does not have
+            parser.error(e.args[0])
+
+    if run_stats is not None:
+        stats.disable()
+        run_stats.add('total', time.perf_counter() - started)
+        if args.profile:
+            print("\n" + run_stats.report())
+        if args.stats_json:
+            with open(args.stats_json, 'w') as f:
+                json.dump(run_stats.to_dict(), f, indent=2)
+            print(f"Stats saved to {args.stats_json}")
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,19 @@
+import glob
+import os
+
+ARCHIVE_EXTENSIONS = ('.cam', '.tac')
+
+
+def expand_archive_paths(patterns):
+    """Resolve paths, directories and glob patterns to a de-duplicated list of archives"""
+    archives = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        elif os.path.isdir(pattern):
+            matches = sorted(os.path.join(pattern, name) for name in os.listdir(pattern)
+                             if name.lower().endswith(ARCHIVE_EXTENSIONS))
+        else:
+            matches = [pattern]
+        archives.extend(matches)
+    return list(dict.fromkeys(archives))
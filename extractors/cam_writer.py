@@ -0,0 +1,108 @@
+import os
+import shutil
+import struct
+from .cam_extractor import EmbeddedFileInfo
+
+
+class CamWriter:
+    """Builds a CAM/TAC archive in the layout CamFile reads.
+
+    Member data is streamed out with large sequential writes right after
+    the 4-byte header. The directory (count, then length-prefixed name,
+    offset and size per member) is appended at the end, and the header's
+    directory offset is patched with a single seek on close. Output goes
+    to a temporary file that replaces filepath on close. To repack an
+    archive onto its own path, close the source CamFile before closing the
+    writer; on Windows an open or mapped file cannot be replaced.
+    """
+
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.file_table = []
+        self._tmp_path = f"{filepath}.{os.getpid()}.tmp"
+        self._file = open(self._tmp_path, 'wb', buffering=self.BUFFER_SIZE)
+        self._file.write(b'\0\0\0\0')  # Directory offset, patched in close()
+        self._offset = 4
+        self._names = set()
+
+    def _add_entry(self, name, size):
+        info = EmbeddedFileInfo(name, self._offset, size)
+        self.file_table.append(info)
+        self._names.add(name)
+        self._offset += size
+        return info
+
+    def _check_name(self, name):
+        """Validate a member name before any of its data is written"""
+        if name in self._names:
+            raise ValueError(f"Duplicate member name: {name}")
+        try:
+            encoded = name.encode('ascii')
+        except UnicodeEncodeError:
+            raise ValueError(f"Member name is not ASCII: {name}")
+        if len(encoded) > 255:
+            raise ValueError(f"Member name too long for a CAM directory: {name}")
+
+    def add(self, name, data):
+        """Add a member from an in-memory buffer (bytes, bytearray or memoryview)"""
+        self._check_name(name)
+        self._file.write(data)
+        return self._add_entry(name, memoryview(data).nbytes)
+
+    def add_file(self, name, path):
+        """Add a member by streaming a file from disk"""
+        self._check_name(name)
+        with open(path, 'rb') as src:
+            shutil.copyfileobj(src, self._file, self.BUFFER_SIZE)
+        return self._add_entry(name, self._file.tell() - self._offset)
+
+    def add_member(self, cam, info, name=None):
+        """Copy a member straight from a loaded CamFile without decoding it"""
+        return self.add(name or info.filename, cam.member_data(info))
+
+    def add_archive(self, cam, replacements=None, exclude=()):
+        """Copy every member of a loaded CamFile, in order.
+
+        replacements maps member names to new data (bytes-like); names in
+        exclude are dropped. Unchanged members are copied straight from the
+        source buffer, which with CamFile(use_mmap=True) costs about as much
+        as a file copy.
+        """
+        replacements = replacements or {}
+        for info in cam.file_table:
+            if info.filename in exclude:
+                continue
+            if info.filename in replacements:
+                self.add(info.filename, replacements[info.filename])
+            else:
+                self.add_member(cam, info)
+
+    def close(self):
+        """Write the directory, patch the header and move the archive into place"""
+        directory_offset = self._offset
+        entries = [struct.pack('<I', len(self.file_table))]
+        for info in self.file_table:
+            encoded = info.filename.encode('ascii')
+            entries.append(struct.pack('<B', len(encoded)) + encoded + struct.pack('<II', info.offset, info.size))
+        self._file.write(b''.join(entries))
+        self._file.seek(0)
+        self._file.write(struct.pack('<I', directory_offset))
+        self._file.close()
+        os.replace(self._tmp_path, self.filepath)
+        print(f"Wrote {len(self.file_table)} members to {self.filepath}")
+
+    def abort(self):
+        """Discard the partially written archive"""
+        self._file.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -9,65 +9,80 @@ from typing import List, Optional, Union
 import struct
 
 
-@dataclass
-class PilotInfoClass:
-    """Represents pilot information in PLT files"""
-    usage: int = 0
-    voice_id: int = 0
-    photo_id: int = 0
-    
+class StructCodec:
+    """Binary encode/decode shared by the fixed-size structures below.
+
+    Each subclass declares its fields in on-disk order and a precompiled
+    struct.Struct in _struct, so decoding is one unpack_from per instance
+    (or one iter_unpack pass for a whole array) with no intermediate
+    slices.
+    """
+    __slots__ = ()
+    _struct: struct.Struct
+
+    @classmethod
+    def size(cls) -> int:
+        """Size of one packed instance in bytes"""
+        return cls._struct.size
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """Create an instance from binary data"""
+        return cls(*cls._struct.unpack_from(data))
+
     @classmethod
-    def from_bytes(cls, data: bytes) -> 'PilotInfoClass':
-        """Create a PilotInfoClass from binary data"""
-        instance = cls()
-        instance.usage = struct.unpack('<h', data[0:2])[0]  # short is 2 bytes
-        instance.voice_id = struct.unpack('<B', data[2:3])[0]  # byte is 1 byte
-        instance.photo_id = struct.unpack('<B', data[3:4])[0]  # byte is 1 byte
-        return instance
-        
+    def from_buffer(cls, buf, offset: int = 0):
+        """Create an instance from buf at offset without copying"""
+        return cls(*cls._struct.unpack_from(buf, offset))
+
+    @classmethod
+    def from_many(cls, buf, count: int, offset: int = 0) -> list:
+        """Decode count consecutive instances starting at offset"""
+        size = cls._struct.size * count
+        view = memoryview(buf)[offset:offset + size]
+        if len(view) < size:
+            raise struct.error(f"{cls.__name__}.from_many needs {size} bytes, got {len(view)}")
+        return [cls(*fields) for fields in cls._struct.iter_unpack(view)]
+
     def to_bytes(self) -> bytes:
         """Convert to binary data"""
-        return struct.pack('<hBB', self.usage, self.voice_id, self.photo_id)
+        return self._struct.pack(*[getattr(self, name) for name in self.__slots__])
 
+    @classmethod
+    def pack_many(cls, items) -> bytes:
+        """Convert a sequence of instances to contiguous binary data"""
+        pack = cls._struct.pack
+        names = cls.__slots__
+        return b''.join([pack(*[getattr(item, name) for name in names]) for item in items])
+
+
+@dataclass(slots=True)
+class PilotInfoClass(StructCodec):
+    """Represents pilot information in PLT files"""
+    usage: int = 0  # short is 2 bytes
+    voice_id: int = 0  # byte is 1 byte
+    photo_id: int = 0  # byte is 1 byte
 
-@dataclass
-class VU_ID:
+    _struct = struct.Struct('<hBB')
+
+
+@dataclass(slots=True)
+class VU_ID(StructCodec):
     """Represents a unique identifier in Falcon BMS"""
     num_: int = 0
     creator_: int = 0
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'VU_ID':
-        """Create a VU_ID from binary data"""
-        instance = cls()
-        instance.num_ = struct.unpack('<I', data[0:4])[0]
-        instance.creator_ = struct.unpack('<I', data[4:8])[0]
-        return instance
-        
-    def to_bytes(self) -> bytes:
-        """Convert to binary data"""
-        return struct.pack('<II', self.num_, self.creator_)
+
+    _struct = struct.Struct('<II')
 
 
-@dataclass
-class vector:
+@dataclass(slots=True)
+class vector(StructCodec):
     """Represents a 3D vector"""
     x: float = 0.0
     y: float = 0.0
     z: float = 0.0
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'vector':
-        """Create a vector from binary data"""
-        instance = cls()
-        instance.x = struct.unpack('<f', data[0:4])[0]
-        instance.y = struct.unpack('<f', data[4:8])[0]
-        instance.z = struct.unpack('<f', data[8:12])[0]
-        return instance
-        
-    def to_bytes(self) -> bytes:
-        """Convert to binary data"""
-        return struct.pack('<fff', self.x, self.y, self.z)
+
+    _struct = struct.Struct('<fff')
 
 
 class VuClassHierarchy(IntEnum):
@@ -119,4 +134,12 @@ class Data_Types(IntEnum):
     DTYPE_WEAPON = 6
 
 
+# Entity types below this are reserved by VU; the class table index of an
+# entity is its type minus VU_LAST_ENTITY_TYPE
+VU_LAST_ENTITY_TYPE = 100
+
+# Number of teams (unit/objective owners)
+NUM_TEAMS = 8
+
+
 # Add more structures and enums as needed for your project
\ No newline at end of file
@@ -1,14 +1,52 @@
+import csv
+import json
 from abc import ABC, abstractmethod
 
+EXPORT_FORMATS = ('text', 'jsonl', 'csv')
+
+# File name suffix for each export format
+EXPORT_SUFFIXES = {'text': '.txt', 'jsonl': '.jsonl', 'csv': '.csv'}
+
 class BaseReader(ABC):
     """Base class for all file format readers"""
     
-    @abstractmethod
     def read(self, filepath):
         """Read data from file"""
-        pass
+        with open(filepath, 'rb') as f:
+            self.read_bytes(f.read(), filepath)
         
     @abstractmethod
     def write(self, filepath):
         """Write data to file"""
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def read_bytes(self, data, filepath=None):
+        """Read data from an in-memory buffer (bytes or memoryview)"""
+        pass
+    
+    def iter_rows(self):
+        """Yield one dict per record, used by the jsonl and csv exports"""
+        raise NotImplementedError(f"{type(self).__name__} has no row export")
+    
+    def iter_text(self):
+        """Yield the human-readable dump line by line"""
+        yield str(self)
+    
+    def export(self, fp, fmt='text'):
+        """Write the parsed data to an open text file one row at a time"""
+        if fmt == 'text':
+            fp.writelines(self.iter_text())
+        elif fmt == 'jsonl':
+            for row in self.iter_rows():
+                fp.write(json.dumps(row))
+                fp.write('\n')
+        elif fmt == 'csv':
+            writer = None
+            for row in self.iter_rows():
+                if writer is None:
+                    writer = csv.DictWriter(fp, fieldnames=list(row), lineterminator='\n')
+                    writer.writeheader()
+                writer.writerow(row)
+        else:
+            raise ValueError(f"Unknown export format '{fmt}', expected one of {EXPORT_FORMATS}")
@@ -1,5 +1,8 @@
 import struct
+import sys
+from array import array
 from dataclasses import dataclass
+from utils import stats
 from .base_reader import BaseReader
 
 @dataclass
@@ -10,52 +13,133 @@ class PilotInfoClass:
 
 
 class PltFile(BaseReader):
+    """Pilot table (.plt) reader.
+    
+    The pilot table is decoded in one pass into three parallel arrays
+    (usage, voice_id, photo_id). PilotInfoClass objects are only created
+    when pilot_info or pilot() is used; once pilot_info has been accessed
+    it is what write() saves, so edits made through it are kept.
+    """
+    
     def __init__(self, filepath=None):
         self.num_pilots = 0
-        self.pilot_info = []
+        self.usage = array('h')
+        self.voice_id = array('B')
+        self.photo_id = array('B')
+        self._pilot_info = None
         self.num_callsigns = 0
         self.callsign_data = []
+        self.filepath = None
         
         if filepath:
             self.read(filepath)
     
-    def read(self, filepath):
-        with open(filepath, 'rb') as f:
-            # Read number of pilots (short/int16)
-            self.num_pilots = struct.unpack('<h', f.read(2))[0]
-            
-            # Read pilot information
-            self.pilot_info = []
-            for _ in range(self.num_pilots):
-                pilot = PilotInfoClass()
-                pilot.usage = struct.unpack('<h', f.read(2))[0]
-                pilot.voice_id = struct.unpack('<B', f.read(1))[0]
-                pilot.photo_id = struct.unpack('<B', f.read(1))[0]
-                self.pilot_info.append(pilot)
-            
-            # Read callsign information
-            self.num_callsigns = struct.unpack('<h', f.read(2))[0]
-            self.callsign_data = list(f.read(self.num_callsigns))
+    @property
+    def pilot_info(self):
+        """Pilots as PilotInfoClass objects, created on first access"""
+        if self._pilot_info is None:
+            self._pilot_info = [PilotInfoClass(usage, voice_id, photo_id)
+                                for usage, voice_id, photo_id in zip(self.usage, self.voice_id, self.photo_id)]
+        return self._pilot_info
+    
+    @pilot_info.setter
+    def pilot_info(self, value):
+        self._pilot_info = value
+    
+    def pilot(self, index):
+        """Return a single pilot without building the whole pilot_info list"""
+        if self._pilot_info is not None:
+            return self._pilot_info[index]
+        return PilotInfoClass(self.usage[index], self.voice_id[index], self.photo_id[index])
+    
+    def read_bytes(self, data, filepath=None):
+        """Parse PLT data already in memory (bytes or memoryview)"""
+        self.filepath = filepath
+        started = stats.start()
+        
+        # Read number of pilots (short/int16)
+        self.num_pilots = struct.unpack_from('<h', data, 0)[0]
+        offset = 2
+        
+        # Read pilot information: <hBB records, split into columns with strided slices
+        table_size = 4 * max(self.num_pilots, 0)
+        table = bytes(data[offset:offset + table_size])
+        if len(table) < table_size:
+            raise struct.error(f"PLT pilot table truncated: expected {table_size} bytes, got {len(table)}")
+        usage_bytes = bytearray(table_size // 2)
+        usage_bytes[0::2] = table[0::4]
+        usage_bytes[1::2] = table[1::4]
+        self.usage = array('h')
+        self.usage.frombytes(usage_bytes)
+        if sys.byteorder == 'big':
+            self.usage.byteswap()
+        self.voice_id = array('B', table[2::4])
+        self.photo_id = array('B', table[3::4])
+        self._pilot_info = None
+        offset += table_size
+        
+        # Read callsign information
+        self.num_callsigns = struct.unpack_from('<h', data, offset)[0]
+        offset += 2
+        self.callsign_data = list(data[offset:offset + self.num_callsigns])
+        stats.record('plt.parse', started, bytes_in=offset + self.num_callsigns)
+    
+    def to_bytes(self):
+        """Return the complete PLT file contents as one buffer"""
+        if self._pilot_info is not None:
+            usage = array('h', [pilot.usage for pilot in self._pilot_info])
+            voice_id = array('B', [pilot.voice_id for pilot in self._pilot_info])
+            photo_id = array('B', [pilot.photo_id for pilot in self._pilot_info])
+        else:
+            usage = array('h', self.usage)
+            voice_id = self.voice_id
+            photo_id = self.photo_id
+        if sys.byteorder == 'big':
+            usage.byteswap()
+        usage_bytes = usage.tobytes()
+        
+        table = bytearray(4 * len(usage))
+        table[0::4] = usage_bytes[0::2]
+        table[1::4] = usage_bytes[1::2]
+        table[2::4] = bytes(voice_id)
+        table[3::4] = bytes(photo_id)
+        
+        return b''.join([
+            struct.pack('<h', self.num_pilots),
+            table,
+            struct.pack('<h', self.num_callsigns),
+            bytes(self.callsign_data),
+        ])
     
     def write(self, filepath):
         with open(filepath, 'wb') as f:
-            # Write number of pilots
-            f.write(struct.pack('<h', self.num_pilots))
-            
-            # Write pilot information
-            for pilot in self.pilot_info:
-                f.write(struct.pack('<h', pilot.usage))
-                f.write(struct.pack('<B', pilot.voice_id))
-                f.write(struct.pack('<B', pilot.photo_id))
-            
-            # Write callsign information
-            f.write(struct.pack('<h', self.num_callsigns))
-            f.write(bytes(self.callsign_data))
+            f.write(self.to_bytes())
+    
+    def iter_rows(self):
+        """Yield one dict per pilot slot, with callsign entry i in the same row.
+        
+        Every row has the same keys so the csv export keeps one header; the
+        row count is max(num_pilots, num_callsigns) and cells past the end of
+        the shorter table are None.
+        """
+        pilots = self._columns()
+        for i in range(max(self.num_pilots, self.num_callsigns)):
+            usage, voice_id, photo_id = next(pilots, (None, None, None))
+            callsign = self.callsign_data[i] if i < len(self.callsign_data) else None
+            yield {'index': i, 'usage': usage, 'voice_id': voice_id, 'photo_id': photo_id,
+                   'callsign': callsign}
+    
+    def iter_text(self):
+        yield f"Number of pilots: {self.num_pilots}\n"
+        for i, (usage, voice_id, photo_id) in enumerate(self._columns()):
+            yield f"Pilot {i}: Usage={usage}, Voice ID={voice_id}, Photo ID={photo_id}\n"
+        yield f"Number of callsigns: {self.num_callsigns}\n"
+        yield f"Callsign data: {self.callsign_data}"
+    
+    def _columns(self):
+        if self._pilot_info is not None:
+            return ((p.usage, p.voice_id, p.photo_id) for p in self._pilot_info)
+        return zip(self.usage, self.voice_id, self.photo_id)
     
     def __str__(self):
-        output = f"Number of pilots: {self.num_pilots}\n"
-        for i, pilot in enumerate(self.pilot_info):
-            output += f"Pilot {i}: Usage={pilot.usage}, Voice ID={pilot.voice_id}, Photo ID={pilot.photo_id}\n"
-        output += f"Number of callsigns: {self.num_callsigns}\n"
-        output += f"Callsign data: {self.callsign_data}"
-        return output
\ No newline at end of file
+        return ''.join(self.iter_text())
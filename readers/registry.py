@@ -0,0 +1,40 @@
+import importlib
+import os
+
+# Member extension -> (module, class) of its BaseReader subclass. Modules
+# are only imported the first time a member with that extension is seen.
+READERS = {
+    '.plt': ('readers.plt_reader', 'PltFile'),
+    '.uni': ('readers.uni_reader', 'UniFile'),
+}
+
+# Extension -> reader class, filled in as readers are imported
+_loaded = {}
+
+
+def register_reader(extension, module, class_name):
+    """Register (or replace) the reader for a member extension such as '.cmp'"""
+    extension = extension.lower()
+    READERS[extension] = (module, class_name)
+    _loaded.pop(extension, None)
+
+
+def reader_for_extension(extension):
+    """Return the reader class for an extension, importing its module on first use, or None"""
+    reader = _loaded.get(extension)
+    if reader is None:
+        spec = READERS.get(extension)
+        if spec is None:
+            return None
+        module, class_name = spec
+        reader = _loaded[extension] = getattr(importlib.import_module(module), class_name)
+    return reader
+
+
+def get_reader(filename):
+    """Return the reader class for a member or file name, or None if no reader handles it"""
+    return reader_for_extension(os.path.splitext(filename)[1].lower())
+
+
+def registered_extensions():
+    return tuple(READERS)
@@ -0,0 +1,120 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from .unit_table import UnitTable, decode_record
+
+MAGIC = b'F4UNIMAP'
+VERSION = 1
+
+# magic, version, reserved, blake2b-16 hash of the source UNI member,
+# numUnits from the UNI header, number of indexed records, payload size.
+# The header is followed by one uint32 record offset per indexed record
+# and then the decompressed payload.
+MAP_HEADER = struct.Struct('<8sHH16shxxII')
+
+
+def write_uni_map(path, payload, num_units, source_hash, offsets):
+    """Write a decompressed UNI payload and its record offsets to a .map file.
+
+    source_hash is the hex member_hash of the compressed member. The file
+    is written to a temporary name and moved into place, so readers never
+    map a half-written file.
+    """
+    table = array('I', offsets)
+    if sys.byteorder == 'big':
+        table.byteswap()
+    header = MAP_HEADER.pack(MAGIC, VERSION, 0, bytes.fromhex(source_hash),
+                             num_units, len(table), len(payload))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(table.tobytes())
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+class UniMap:
+    """Read-only, memory-mapped view of a decompressed UNI payload.
+
+    Only the header and the record offset table are read when the map is
+    opened; record(i) touches just the pages holding that record. Every
+    process mapping the same file shares its pages through the OS cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty UNI map: {path}")
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+        self._units = None
+
+    def _parse(self):
+        if len(self._mmap) < MAP_HEADER.size:
+            raise ValueError(f"Truncated UNI map header in {self.path}")
+        magic, version, _, source_hash, num_units, count, payload_size = MAP_HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a UNI map: {self.path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported UNI map version {version} in {self.path}")
+        payload_start = MAP_HEADER.size + 4 * count
+        if payload_start + payload_size != len(self._mmap):
+            raise ValueError(f"UNI map {self.path} is {len(self._mmap)} bytes, header expects "
+                             f"{payload_start + payload_size}")
+
+        self.source_hash = source_hash.hex()
+        self.num_units = num_units
+        self.offsets = array('I', self._mmap[MAP_HEADER.size:payload_start])
+        if sys.byteorder == 'big':
+            self.offsets.byteswap()
+        self.payload = memoryview(self._mmap)[payload_start:]
+
+    def matches(self, source_hash):
+        """True if the map was built from the member with this member_hash"""
+        return self.source_hash == source_hash
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def record_bounds(self, index):
+        """Return (start, end) of a record in the payload"""
+        start = self.offsets[index]
+        end = self.offsets[index + 1] if index + 1 < len(self.offsets) else len(self.payload)
+        return start, end
+
+    def record(self, index):
+        """Decode the record at index straight from the mapped pages"""
+        start, end = self.record_bounds(index)
+        return decode_record(self.payload, index, start, end)
+
+    @property
+    def units(self):
+        """UnitTable over the mapped payload, built from the stored offsets without a scan"""
+        if self._units is None:
+            self._units = UnitTable(self.payload, self.num_units, offsets=self.offsets)
+        return self._units
+
+    def close(self):
+        self._units = None
+        self.payload = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Record views are still alive; the map is freed with them
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
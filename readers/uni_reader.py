@@ -2,24 +2,30 @@ from .base_reader import BaseReader
 import os
 import struct
 from utils.lzss import decompress
-from utils.lzsscontext import lzss_expand  # Using the Python lzss library
+from .unit_table import UnitTable
+from .uni_map import write_uni_map
+from utils import stats
+from utils.lzsscontext import get_expander, iter_expand, lzss_compress
+from utils.member_cache import member_hash
 
 class UniFile(BaseReader):
-    def __init__(self, filepath=None):
+    def __init__(self, filepath=None, expander='fast', cache=None):
+        self.expander = get_expander(expander)
+        self.cache = cache
         self.raw_data = None
         self.decompressed_data = None
         self.filepath = None
         self.num_units = 0
+        self._units = None
         
         if filepath:
             self.read(filepath)
     
-    def read(self, filepath):
-        """Read UNI file and decompress it"""
+    def read_bytes(self, data, filepath=None):
+        """Decompress UNI data already in memory (bytes or memoryview)"""
         self.filepath = filepath
-        
-        with open(filepath, 'rb') as f:
-            self.raw_data = f.read()
+        self.raw_data = data
+        self._units = None
         
         # Parse header according to .NET code
         try:
@@ -45,11 +51,26 @@ class UniFile(BaseReader):
             print(f"Header info: numUnits={self.num_units}, decompressedSize={decompressed_size}")
             print(f"Compressed data size: {len(compressed_data)} bytes")
             
+            # Skip decompression when this exact member has been seen before
+            cache_key = self.cache.key(self.raw_data) if self.cache is not None else None
+            if cache_key is not None:
+                cached = self.cache.get(cache_key, 'uni.dec')
+                if cached is not None and len(cached) == decompressed_size:
+                    self.decompressed_data = cached
+                    stats.count('cache.hits')
+                    print(f"Loaded {len(cached)} decompressed bytes from cache")
+                    return
+            
             # Decompress using our custom implementation
             # self.decompressed_data = decompress(compressed_data, decompressed_size)
-            self.decompressed_data = lzss_expand(compressed_data, decompressed_size)
+            started = stats.start()
+            self.decompressed_data = self.expander(compressed_data, decompressed_size)
+            stats.record('lzss.expand', started, bytes_in=len(compressed_data), bytes_out=len(self.decompressed_data))
             
             print(f"Successfully decompressed to {len(self.decompressed_data)} bytes")
+            
+            if cache_key is not None:
+                self.cache.put(cache_key, 'uni.dec', self.decompressed_data)
                 
         except Exception as e:
             print(f"Error processing {filepath}: {e}")
@@ -57,6 +78,53 @@ class UniFile(BaseReader):
             traceback.print_exc()
             self.decompressed_data = None
     
+    @property
+    def units(self):
+        """UnitTable over the decompressed data, indexed on first access"""
+        if self._units is None and self.decompressed_data:
+            self._units = UnitTable(self.decompressed_data, self.num_units)
+        return self._units
+    
+    def iter_rows(self):
+        """Yield one dict per unit record"""
+        units = self.units
+        if units is None:
+            return
+        for i in range(len(units)):
+            yield {
+                'index': i,
+                'offset': units.offsets[i],
+                'num': units.id_num[i],
+                'creator': units.id_creator[i],
+                'entity_type': units.entity_type[i],
+                'class_index': units.class_index(i),
+                'x': units.x[i],
+                'y': units.y[i],
+                'z': units.z[i],
+                'owner': units.owner[i],
+            }
+    
+    def iter_text(self):
+        yield f"{self}\n"
+        for row in self.iter_rows():
+            yield (f"Unit {row['index']}: ID={row['num']}:{row['creator']}, Type={row['entity_type']}, "
+                   f"Position=({row['x']}, {row['y']}, {row['z']}), Owner={row['owner']}\n")
+    
+    def iter_read(self, filepath, chunk_size=65536):
+        """Yield decompressed chunks of a UNI file while reading it incrementally.
+        
+        Only the header is parsed up front (num_units is set); the payload is
+        never held in memory as a whole and decompressed_data is left untouched.
+        """
+        self.filepath = filepath
+        with open(filepath, 'rb') as f:
+            header = f.read(10)
+            if len(header) < 10:
+                raise EOFError(f"Truncated UNI header in {filepath}")
+            self.num_units = struct.unpack_from('<h', header, 4)[0]
+            decompressed_size = struct.unpack_from('<i', header, 6)[0]
+            yield from iter_expand(iter(lambda: f.read(chunk_size), b''), decompressed_size)
+    
     # Rest of the class remains the same...
     
     def write(self, filepath):
@@ -67,6 +135,21 @@ class UniFile(BaseReader):
             return True
         return False
     
+    def compress(self):
+        """Return a complete UNI file with decompressed_data LZSS-compressed"""
+        compressed_data = lzss_compress(self.decompressed_data)
+        # Leading size counts everything after itself: header (6) + payload
+        header = struct.pack('<ihi', 6 + len(compressed_data), self.num_units, len(self.decompressed_data))
+        return header + compressed_data
+    
+    def save_compressed(self, filepath):
+        """Write the (possibly edited) decompressed data back as a compressed UNI file"""
+        if not self.decompressed_data:
+            return False
+        with open(filepath, 'wb') as f:
+            f.write(self.compress())
+        return True
+    
     def save_decompressed(self, output_dir=None):
         """Save the decompressed data to a file with .dec extension"""
         if not self.decompressed_data:
@@ -85,6 +168,26 @@ class UniFile(BaseReader):
         print(f"Saved decompressed data to {output_path}")
         return True
     
+    def save_mapped(self, output_dir=None):
+        """Save the decompressed data and unit offsets as a .map file for UniMap.
+        
+        Later processes can mmap the file and read unit records at random
+        without decompressing again.
+        """
+        if not self.decompressed_data:
+            return False
+        
+        if output_dir:
+            output_path = os.path.join(output_dir, f"{os.path.basename(self.filepath)}.map")
+        else:
+            output_path = f"{self.filepath}.map"
+        
+        units = self.units
+        write_uni_map(output_path, self.decompressed_data, self.num_units,
+                      member_hash(self.raw_data), units.offsets)
+        print(f"Saved memory-mappable payload ({len(units)} units) to {output_path}")
+        return True
+    
     def __str__(self):
         if self.decompressed_data:
             return f"UNI file: {self.filepath}\nCompressed size: {len(self.raw_data)}\nDecompressed size: {len(self.decompressed_data)}"
@@ -0,0 +1,151 @@
+import re
+import struct
+from array import array
+from dataclasses import dataclass
+from models.f4structs import NUM_TEAMS, VU_LAST_ENTITY_TYPE, VU_ID, vector
+
+# Common prefix of every unit record in decompressed UNI data:
+# type, VU_ID (num, creator), entity type (same as type), grid x, grid y,
+# z, spot time, spotted, base flags, owner, campaign id
+UNIT_HEADER = struct.Struct('<HIIHhhfIhhBh')
+
+# Generous bound on theater size in grid cells, used to reject false matches
+MAX_GRID_INDEX = 4096
+
+# A record starts where the leading type repeats after the 8-byte VU_ID;
+# null and 0xFFFF types and a zero VU_ID number are never real units.
+# Candidates are further checked against the decoded header in _index()
+_RECORD_START = re.compile(rb'(?=(?!\x00\x00|\xff\xff)(..)(?!\x00\x00\x00\x00).{8}\1)', re.DOTALL)
+
+
+@dataclass
+class UnitRecord:
+    """A fully decoded unit record header plus its type-specific bytes"""
+    index: int
+    id: VU_ID
+    entity_type: int
+    position: vector
+    spot_time: int
+    spotted: int
+    base_flags: int
+    owner: int
+    camp_id: int
+    body: memoryview
+
+    @property
+    def class_index(self):
+        return self.entity_type - VU_LAST_ENTITY_TYPE
+
+
+class UnitTable:
+    """Index over the unit records in decompressed UNI data.
+
+    One pass locates every record and fills columnar arrays with the
+    fields most queries need (id_num, id_creator, entity_type, x, y, z,
+    owner). Record lengths depend on the unit class and are not stored in
+    the file, so records are found by their common header: the type is
+    written twice around the VU_ID. record(i) decodes a full record only
+    when it is asked for. Record offsets known from an earlier scan (for
+    instance from a UniMap) can be passed in to skip the scan.
+    """
+
+    def __init__(self, payload, num_units=None, offsets=None):
+        self.payload = memoryview(payload)
+        self.num_units = num_units
+        self.offsets = array('I')
+        self.id_num = array('I')
+        self.id_creator = array('I')
+        self.entity_type = array('H')
+        self.x = array('h')
+        self.y = array('h')
+        self.z = array('f')
+        self.owner = array('B')
+        self._by_id = None
+        if offsets is None:
+            self._index()
+        else:
+            for offset in offsets:
+                self._add(offset, UNIT_HEADER.unpack_from(self.payload, offset))
+
+    def _add(self, offset, header):
+        (_, num, creator, entity_type, x, y, z, _, _, _, owner, _) = header
+        self.offsets.append(offset)
+        self.id_num.append(num)
+        self.id_creator.append(creator)
+        self.entity_type.append(entity_type)
+        self.x.append(x)
+        self.y.append(y)
+        self.z.append(z)
+        self.owner.append(owner)
+
+    def _index(self):
+        data = self.payload
+        next_start = 0
+        for match in _RECORD_START.finditer(data):
+            offset = match.start()
+            if offset < next_start:
+                continue
+            if offset + UNIT_HEADER.size > len(data):
+                break
+            header = UNIT_HEADER.unpack_from(data, offset)
+            (_, _, _, entity_type, x, y, _, _, _, _, owner, _) = header
+            if (entity_type < VU_LAST_ENTITY_TYPE or owner >= NUM_TEAMS
+                    or not 0 <= x < MAX_GRID_INDEX or not 0 <= y < MAX_GRID_INDEX):
+                continue
+            self._add(offset, header)
+            next_start = offset + UNIT_HEADER.size
+
+        if self.num_units is not None and len(self.offsets) != self.num_units:
+            # Extra candidates are kept: which one is a false match cannot be told from the header
+            print(f"Warning: found {len(self.offsets)} unit records, header says {self.num_units}")
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def record_bounds(self, index):
+        """Return (start, end) of a record in the payload"""
+        start = self.offsets[index]
+        end = self.offsets[index + 1] if index + 1 < len(self.offsets) else len(self.payload)
+        return start, end
+
+    def id(self, index):
+        return VU_ID(self.id_num[index], self.id_creator[index])
+
+    def position(self, index):
+        return vector(float(self.x[index]), float(self.y[index]), self.z[index])
+
+    def class_index(self, index):
+        return self.entity_type[index] - VU_LAST_ENTITY_TYPE
+
+    def find(self, num, creator=0):
+        """Return the index of the unit with the given VU_ID, or None"""
+        if self._by_id is None:
+            self._by_id = {key: i for i, key in enumerate(zip(self.id_num, self.id_creator))}
+        return self._by_id.get((num, creator))
+
+    def record(self, index):
+        """Decode the full record at index"""
+        start, end = self.record_bounds(index)
+        return decode_record(self.payload, index, start, end)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.record(index)
+
+
+def decode_record(payload, index, start, end):
+    """Decode the record occupying payload[start:end]"""
+    (_, num, creator, entity_type, x, y, z,
+     spot_time, spotted, base_flags, owner, camp_id) = UNIT_HEADER.unpack_from(payload, start)
+    return UnitRecord(
+        index=index,
+        id=VU_ID(num, creator),
+        entity_type=entity_type,
+        position=vector(float(x), float(y), z),
+        spot_time=spot_time,
+        spotted=spotted,
+        base_flags=base_flags,
+        owner=owner,
+        camp_id=camp_id,
+        body=payload[start + UNIT_HEADER.size:end],
+    )
@@ -1,3 +1,29 @@
+from dataclasses import dataclass, field
+
+# Warnings kept in DecompressDiagnostics.warnings; later ones are only counted
+MAX_WARNINGS = 100
+
+
+@dataclass
+class DecompressDiagnostics:
+    """What decompress_fast found wrong with a stream, instead of printing it"""
+    output_size: int = 0          # Bytes produced before the stream ran out
+    input_used: int = 0           # Compressed bytes consumed
+    max_reference: int = 0        # Largest valid back-reference distance
+    invalid_references: int = 0   # References reaching before the start of the output
+    placeholder_bytes: int = 0    # Output bytes zero-filled instead of copied
+    truncated: bool = False       # Stream ended before decompressed_size bytes
+    warnings: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return not (self.truncated or self.invalid_references or self.placeholder_bytes)
+
+    def warn(self, message):
+        if len(self.warnings) < MAX_WARNINGS:
+            self.warnings.append(message)
+
+
 def decompress(compressed_data, decompressed_size):
     """
     Decompress data using LZSS algorithm based on the LzssNative implementation
@@ -82,4 +108,126 @@ def decompress(compressed_data, decompressed_size):
             # Shift to next flag bit
             flags <<= 1
     
-    return bytes(result)
\ No newline at end of file
+    return bytes(result)
+
+
+def _scan(compressed_data, decompressed_size):
+    """Walk the token stream of decompress without producing output.
+    
+    Which references are invalid depends only on the compressed bytes
+    and the output position, so one pass finds every problem and counts
+    the tokens the copy loop will execute.
+    """
+    diagnostics = DecompressDiagnostics()
+    n = len(compressed_data)
+    i_byte = o_byte = tokens = 0
+    while o_byte < decompressed_size:
+        if i_byte >= n:
+            break
+        flags = compressed_data[i_byte]
+        i_byte += 1
+        if flags == 0xFF and i_byte + 8 <= n and o_byte + 8 <= decompressed_size:
+            # Eight literals
+            i_byte += 8
+            o_byte += 8
+            tokens += 8
+            continue
+        for _ in range(8):
+            if o_byte >= decompressed_size:
+                break
+            if flags & 0x80:
+                if i_byte >= n:
+                    break
+                i_byte += 1
+                o_byte += 1
+            else:
+                if i_byte + 1 >= n:
+                    break
+                offset_lo = compressed_data[i_byte + 1]
+                string_pos = (compressed_data[i_byte] << 4) | (offset_lo >> 4)
+                string_len = (offset_lo & 0x0F) + 3
+                i_byte += 2
+                produced = min(string_len, decompressed_size - o_byte)
+                if string_pos > o_byte:
+                    diagnostics.invalid_references += 1
+                    diagnostics.placeholder_bytes += produced
+                    diagnostics.warn(f"Reference beyond current buffer at o_byte={o_byte}, string_pos={string_pos}")
+                    o_byte += produced
+                    tokens += 1
+                    continue  # decompress does not shift the flags here
+                if string_pos > diagnostics.max_reference:
+                    diagnostics.max_reference = string_pos
+                if string_pos < produced:
+                    # Bytes from index string_pos on read past the write position
+                    diagnostics.placeholder_bytes += produced - string_pos
+                    diagnostics.warn(f"Invalid reference at o_byte={o_byte + string_pos}, "
+                                     f"pos={o_byte + string_pos}")
+                o_byte += produced
+            tokens += 1
+            flags <<= 1
+
+    diagnostics.output_size = o_byte
+    diagnostics.input_used = min(i_byte, n)
+    diagnostics.truncated = o_byte < decompressed_size
+    return tokens, diagnostics
+
+
+def decompress_fast(compressed_data, decompressed_size):
+    """
+    Fast mode of decompress: same output, no per-byte checks or printing
+    
+    The stream is validated once up front by _scan; the copy loop then runs
+    exactly the counted tokens without bounds checks, copying each match
+    with slice assignments. Problems are reported in the returned
+    DecompressDiagnostics rather than printed.
+    
+    Returns:
+        (bytes, DecompressDiagnostics)
+    """
+    tokens, diagnostics = _scan(compressed_data, decompressed_size)
+    data = bytes(compressed_data)
+    # Slack for the last token, so matches never need clipping to the output size
+    result = bytearray(decompressed_size + 18)
+    i_byte = 0
+    o_byte = 0
+
+    while tokens:
+        flags = data[i_byte]
+        i_byte += 1
+        if flags == 0xFF and tokens >= 8:
+            result[o_byte:o_byte + 8] = data[i_byte:i_byte + 8]
+            i_byte += 8
+            o_byte += 8
+            tokens -= 8
+            continue
+        for _ in range(8 if tokens >= 8 else tokens):
+            if flags & 0x80:
+                result[o_byte] = data[i_byte]
+                i_byte += 1
+                o_byte += 1
+            else:
+                offset_lo = data[i_byte + 1]
+                string_pos = (data[i_byte] << 4) | (offset_lo >> 4)
+                string_len = (offset_lo & 0x0F) + 3
+                i_byte += 2
+                if string_pos > o_byte:
+                    # Zero placeholder: nothing past o_byte has been written yet
+                    o_byte += string_len
+                    continue
+                # decompress reads result[o_byte + 2*j - string_pos] for byte j, and
+                # leaves zeros from j = string_pos on
+                copied = string_len if string_len < string_pos else string_pos
+                start = o_byte - string_pos
+                half = (string_pos + 1) >> 1
+                if copied <= half:
+                    result[o_byte:o_byte + copied] = result[start:start + 2 * copied:2]
+                else:
+                    result[o_byte:o_byte + half] = result[start:start + 2 * half:2]
+                    for j in range(half, copied):
+                        result[o_byte + j] = result[start + 2 * j]
+                o_byte += string_len
+            flags <<= 1
+        tokens -= 8 if tokens >= 8 else tokens
+
+    del result[decompressed_size:]
+    return bytes(result), diagnostics
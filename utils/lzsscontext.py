@@ -72,3 +72,248 @@ def lzss_expand(input_bytes: bytes, output_size: int) -> bytes:
                 current_position = (current_position + 1) & (ctxt.WINDOW_SIZE - 1)
 
     return bytes(output_bytes)
+
+
+def lzss_expand_fast(input_bytes: bytes, output_size: int) -> bytes:
+    """Byte-identical to lzss_expand, restructured for speed.
+
+    One flag byte is handled per outer iteration, matches are copied as
+    slices and output goes into a preallocated buffer. The buffer is
+    prefixed with WINDOW_SIZE zero bytes standing in for the initial
+    (empty) window, so every back reference is a plain buffer offset.
+    """
+    window_size = LZSSContext.WINDOW_SIZE
+    window_mask = window_size - 1
+    min_match = LZSSContext.BREAK_EVEN + 1
+
+    end = window_size + output_size
+    out = bytearray(end)
+    o = window_size
+    i = 0
+
+    while o < end:
+        flags = input_bytes[i]
+        i += 1
+
+        if flags == 0xFF and end - o >= 8 and len(input_bytes) - i >= 8:
+            # Eight literals in a row
+            out[o:o + 8] = input_bytes[i:i + 8]
+            i += 8
+            o += 8
+            continue
+
+        for _ in range(8):
+            if o >= end:
+                break
+            if flags & 1:
+                out[o] = input_bytes[i]
+                i += 1
+                o += 1
+            else:
+                hi = input_bytes[i]
+                match_position = ((hi & 0xF) << 8) | input_bytes[i + 1]
+                i += 2
+                length = (hi >> 4) + min_match
+                if length > end - o:
+                    length = end - o
+
+                # Window slot of the next output byte is (o + 1) & mask
+                # (o already includes the window-sized prefix)
+                distance = (o + 1 - match_position) & window_mask or window_size
+                src = o - distance
+                if distance >= length:
+                    out[o:o + length] = out[src:src + length]
+                else:
+                    # Overlapping match: the last `distance` bytes repeat
+                    pattern = out[src:o]
+                    out[o:o + length] = (pattern * (length // distance + 1))[:length]
+                o += length
+            flags >>= 1
+
+    return bytes(out[window_size:])
+
+
+class LZSSDecoder:
+    """Incremental version of lzss_expand.
+
+    Compressed data is passed in arbitrary chunks through feed(), which
+    returns whatever output could be decoded so far. Between calls only
+    the last WINDOW_SIZE output bytes and an incomplete token (at most
+    two bytes) are kept, so memory stays bounded however large the
+    stream is.
+    """
+
+    def __init__(self, output_size):
+        self.remaining = output_size
+        self.total_out = 0
+        self._history = bytes(LZSSContext.WINDOW_SIZE)
+        self._pending = b''
+        self._flags = 0
+        self._flag_bits = 0
+
+    @property
+    def finished(self):
+        return self.remaining == 0
+
+    def feed(self, chunk) -> bytes:
+        """Decode as much as possible of chunk and return the new output"""
+        window_size = LZSSContext.WINDOW_SIZE
+        window_mask = window_size - 1
+        min_match = LZSSContext.BREAK_EVEN + 1
+
+        data = self._pending + bytes(chunk)
+        n = len(data)
+        i = 0
+        flags = self._flags
+        bits = self._flag_bits
+
+        out = bytearray(self._history)
+        o = window_size
+        end = window_size + self.remaining
+        # Maps a position in out to its window slot, (output index + 1) & mask
+        slot_base = self.total_out + 1 - window_size
+
+        while o < end:
+            if not bits:
+                if i >= n:
+                    break
+                flags = data[i]
+                i += 1
+                bits = 8
+            if flags & 1:
+                if i >= n:
+                    break
+                out.append(data[i])
+                i += 1
+                o += 1
+            else:
+                if i + 1 >= n:
+                    break
+                hi = data[i]
+                match_position = ((hi & 0xF) << 8) | data[i + 1]
+                i += 2
+                length = (hi >> 4) + min_match
+                if length > end - o:
+                    length = end - o
+                distance = (o + slot_base - match_position) & window_mask or window_size
+                src = o - distance
+                if distance >= length:
+                    out += out[src:src + length]
+                else:
+                    pattern = out[src:o]
+                    out += (pattern * (length // distance + 1))[:length]
+                o += length
+            flags >>= 1
+            bits -= 1
+
+        self._pending = data[i:]
+        self._flags = flags
+        self._flag_bits = bits
+        self._history = bytes(out[-window_size:])
+
+        produced = o - window_size
+        self.remaining -= produced
+        self.total_out += produced
+        return bytes(out[window_size:])
+
+
+def iter_expand(chunks, output_size):
+    """Yield decompressed chunks from an iterable of compressed chunks"""
+    decoder = LZSSDecoder(output_size)
+    for chunk in chunks:
+        output = decoder.feed(chunk)
+        if output:
+            yield output
+        if decoder.finished:
+            return
+    if not decoder.finished:
+        raise EOFError(f"Compressed stream ended with {decoder.remaining} bytes still expected")
+
+
+def lzss_compress(data: bytes, max_chain: int = 64) -> bytes:
+    """Compress data into the stream format read by lzss_expand.
+
+    Candidate matches are kept in hash chains keyed on the next two bytes,
+    so each position only visits earlier positions that can actually match
+    (at most max_chain of them) instead of scanning the whole window.
+    Matches are chosen greedily.
+    """
+    window_size = LZSSContext.WINDOW_SIZE
+    window_mask = window_size - 1
+    min_match = LZSSContext.BREAK_EVEN + 1
+    max_match = min_match + LZSSContext.RAW_LOOK_AHEAD_SIZE - 1
+    max_distance = window_size - 1
+
+    n = len(data)
+    head = [-1] * 0x10000
+    prev = [-1] * n
+    output_bytes = bytearray()
+    flag_pos = 0
+    flag_bit = 0x100
+
+    i = 0
+    while i < n:
+        if flag_bit == 0x100:
+            flag_pos = len(output_bytes)
+            output_bytes.append(0)
+            flag_bit = 1
+
+        best_len = 0
+        best_pos = 0
+        limit = n - i
+        if limit >= min_match:
+            if limit > max_match:
+                limit = max_match
+            lowest = i - max_distance
+            candidate = head[(data[i] << 8) | data[i + 1]]
+            chain = max_chain
+            while candidate >= lowest and candidate >= 0 and chain:
+                # Cheap reject: a longer match must also agree at best_len
+                if data[candidate + best_len] == data[i + best_len]:
+                    length = min_match
+                    while length < limit and data[candidate + length] == data[i + length]:
+                        length += 1
+                    if length > best_len:
+                        best_len = length
+                        best_pos = candidate
+                        if length == limit:
+                            break
+                candidate = prev[candidate]
+                chain -= 1
+
+        if best_len >= min_match:
+            # Window slot of output byte k is (k + 1) & mask
+            match_position = (best_pos + 1) & window_mask
+            output_bytes.append(((best_len - min_match) << 4) | (match_position >> 8))
+            output_bytes.append(match_position & 0xFF)
+            end = i + best_len
+        else:
+            output_bytes[flag_pos] |= flag_bit
+            output_bytes.append(data[i])
+            end = i + 1
+        flag_bit <<= 1
+
+        # Index every position we move past (keys need two bytes)
+        stop = end if end < n else n - 1
+        while i < stop:
+            key = (data[i] << 8) | data[i + 1]
+            prev[i] = head[key]
+            head[key] = i
+            i += 1
+        i = end
+
+    return bytes(output_bytes)
+
+
+EXPANDERS = {
+    'context': lzss_expand,
+    'fast': lzss_expand_fast,
+}
+
+
+def get_expander(name):
+    """Return the LZSS expand function registered under name"""
+    try:
+        return EXPANDERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown LZSS expander '{name}', expected one of {sorted(EXPANDERS)}")
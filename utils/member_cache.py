@@ -0,0 +1,140 @@
+import hashlib
+import os
+import shutil
+
+
+def member_hash(data):
+    """Hash raw member bytes (bytes or memoryview) into a hex digest"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class MemberCache:
+    """Content-addressed on-disk cache for decompressed and parsed members.
+
+    Entries are keyed by a hash of a member's raw bytes plus a kind such
+    as 'uni.dec' or 'plt.txt', so an unchanged member maps to the same
+    entry whatever archive or autosave it comes from. Total size is kept
+    under max_bytes by evicting the least recently used entries (mtime is
+    refreshed on every hit) down to LOW_WATER of max_bytes, so the cache
+    directory is only walked again after a tenth of it has been replaced.
+    Entries are written atomically, so several worker processes can share
+    one cache directory.
+    """
+
+    LOW_WATER = 0.9
+
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(data):
+        """Cache key for raw member bytes"""
+        return member_hash(data)
+
+    def _path(self, key, kind):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{kind}")
+
+    def get(self, key, kind):
+        """Return the cached bytes for key/kind, or None on a miss"""
+        path = self._path(key, kind)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def copy_to(self, key, kind, dest_path):
+        """Copy a cached entry to dest_path; returns False on a miss"""
+        path = self._path(key, kind)
+        try:
+            shutil.copyfile(path, dest_path)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return True
+
+    def put_file(self, key, kind, src_path):
+        """Store the contents of src_path without reading it into memory"""
+        path = self._path(key, kind)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.copyfile(src_path, tmp_path)
+        replaced = _file_size(path)
+        os.replace(tmp_path, path)
+        self._added(os.path.getsize(path) - replaced)
+
+    def put(self, key, kind, data):
+        """Store data for key/kind, evicting old entries if the cache is over size"""
+        path = self._path(key, kind)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        replaced = _file_size(path)
+        os.replace(tmp_path, path)
+        self._added(len(data) - replaced)
+
+    def _added(self, added):
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += added
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Evicted by another process
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache is down to LOW_WATER of max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.LOW_WATER
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def __str__(self):
+        return f"Cache {self.cache_dir}: {self.hits} hits, {self.misses} misses"
+
+
+def _file_size(path):
+    """Size of an existing entry about to be overwritten, or 0"""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
@@ -0,0 +1,100 @@
+"""
+Lightweight timing and counters for the archive/decompression hot paths.
+
+Instrumented code calls start() before a stage and record() after it.
+While no Stats object is active, start() returns None and record()
+returns immediately, so the cost when profiling is off is one function
+call and a None check per stage.
+
+    stats = enable()
+    ...            # load, extract, process
+    print(stats.report())
+"""
+
+import time
+
+_active = None
+
+
+class Stats:
+    """Per-stage wall time, call counts and bytes in/out, plus free-form counters"""
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+
+    def add(self, name, seconds, bytes_in=0, bytes_out=0, calls=1):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = {'calls': 0, 'seconds': 0.0, 'bytes_in': 0, 'bytes_out': 0}
+        stage['calls'] += calls
+        stage['seconds'] += seconds
+        stage['bytes_in'] += bytes_in
+        stage['bytes_out'] += bytes_out
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, data):
+        """Add the contents of another Stats.to_dict() (e.g. from a worker process)"""
+        for name, stage in data.get('stages', {}).items():
+            self.add(name, stage['seconds'], stage['bytes_in'], stage['bytes_out'], stage['calls'])
+        for name, n in data.get('counters', {}).items():
+            self.count(name, n)
+
+    def to_dict(self):
+        stages = {}
+        for name, stage in self.stages.items():
+            stages[name] = dict(stage)
+            seconds = stage['seconds']
+            stages[name]['mb_per_s_in'] = stage['bytes_in'] / seconds / 1e6 if seconds else None
+            stages[name]['mb_per_s_out'] = stage['bytes_out'] / seconds / 1e6 if seconds else None
+        return {'stages': stages, 'counters': dict(self.counters)}
+
+    def report(self):
+        lines = [f"{'stage':24s} {'calls':>7s} {'seconds':>10s} {'MB in':>10s} {'MB out':>10s} {'MB/s out':>10s}"]
+        for name, stage in sorted(self.stages.items(), key=lambda item: -item[1]['seconds']):
+            seconds = stage['seconds']
+            throughput = f"{stage['bytes_out'] / seconds / 1e6:10.1f}" if seconds and stage['bytes_out'] else f"{'':10s}"
+            lines.append(f"{name:24s} {stage['calls']:7d} {seconds:10.4f} "
+                         f"{stage['bytes_in'] / 1e6:10.3f} {stage['bytes_out'] / 1e6:10.3f} {throughput}")
+        for name, n in sorted(self.counters.items()):
+            lines.append(f"{name:24s} {n:7d}")
+        return "\n".join(lines)
+
+
+def enable(stats=None):
+    """Start collecting into stats (a new Stats by default) and return it"""
+    global _active
+    _active = stats if stats is not None else Stats()
+    return _active
+
+
+def disable():
+    """Stop collecting and return the Stats that was active, if any"""
+    global _active
+    stats, _active = _active, None
+    return stats
+
+
+def active():
+    return _active
+
+
+def start():
+    """Timestamp for record(), or None while collection is off"""
+    if _active is None:
+        return None
+    return time.perf_counter()
+
+
+def record(name, started, bytes_in=0, bytes_out=0):
+    """Close a stage opened with start()"""
+    if started is None or _active is None:
+        return
+    _active.add(name, time.perf_counter() - started, bytes_in, bytes_out)
+
+
+def count(name, n=1):
+    if _active is not None:
+        _active.count(name, n)